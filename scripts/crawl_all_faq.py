@@ -2,6 +2,8 @@
 """全量爬取所有 FAQ 資料源"""
 
 import sys
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # 加入專案根目錄到 sys.path
@@ -16,14 +18,27 @@ from src.crawlers.bli_faq import BLIFaqCrawler
 from src.storage.jsonl_handler import JSONLHandler
 from src.storage.index_manager import IndexManager
 
-# 設定日誌
+# 設定日誌（enqueue=True 交由背景執行緒寫出，不阻塞爬取；終端只顯示 INFO 以上）
+logger.remove()
+logger.add(sys.stderr, level="INFO", enqueue=True)
 logger.add(
     "logs/crawl_all_faq.log",
     rotation="10 MB",
     retention="7 days",
-    level="INFO"
+    level="INFO",
+    enqueue=True
 )
 
+# 三個資料源共用的儲存與索引管理器
+storage = JSONLHandler()
+index_mgr = IndexManager()
+
+
+@functools.lru_cache(maxsize=1)
+def _get_config():
+    """載入爬蟲配置（只讀取一次 YAML）"""
+    return ConfigLoader().get_crawler_config()
+
 
 def crawl_mol():
     """爬取勞動部常見問答"""
@@ -31,8 +46,7 @@ def crawl_mol():
     logger.info("開始爬取: 勞動部常見問答 (MOL)")
     logger.info("=" * 70)
 
-    config_loader = ConfigLoader()
-    config = config_loader.get_crawler_config()
+    config = _get_config()
 
     crawler = MOLFaqCrawler(config)
 
@@ -41,13 +55,11 @@ def crawl_mol():
 
     if all_data:
         # 儲存資料
-        storage = JSONLHandler()
         storage.write_items('mol_faq', all_data, mode='w')
         logger.info(f"✓ MOL 資料已儲存: {len(all_data)} 筆")
 
         # 建立索引
-        index_mgr = IndexManager()
-        index_mgr.build_index('mol_faq', all_data)
+        index_mgr.build_index('mol_faq', storage.stream_read('mol_faq'))
         logger.info("✓ MOL 索引已建立")
 
     return len(all_data) if all_data else 0
@@ -59,8 +71,7 @@ def crawl_osha():
     logger.info("開始爬取: 職業安全衛生署常見問答 (OSHA)")
     logger.info("=" * 70)
 
-    config_loader = ConfigLoader()
-    config = config_loader.get_crawler_config()
+    config = _get_config()
 
     crawler = OSHAFaqCrawler(config)
 
@@ -69,13 +80,11 @@ def crawl_osha():
 
     if all_data:
         # 儲存資料
-        storage = JSONLHandler()
         storage.write_items('osha_faq', all_data, mode='w')
         logger.info(f"✓ OSHA 資料已儲存: {len(all_data)} 筆")
 
         # 建立索引
-        index_mgr = IndexManager()
-        index_mgr.build_index('osha_faq', all_data)
+        index_mgr.build_index('osha_faq', storage.stream_read('osha_faq'))
         logger.info("✓ OSHA 索引已建立")
 
     return len(all_data) if all_data else 0
@@ -87,26 +96,21 @@ def crawl_bli():
     logger.info("開始爬取: 勞動部勞工保險局常見問答 (BLI)")
     logger.info("=" * 70)
 
-    config_loader = ConfigLoader()
-    config = config_loader.get_crawler_config()
+    config = _get_config()
 
     crawler = BLIFaqCrawler(config)
 
-    # 全量爬取
-    all_data = crawler.crawl_all(source_name='bli')
+    # 全量爬取（邊爬邊寫入，不在記憶體保留全部資料）
+    count = storage.write_stream('bli_faq', crawler.iter_all(source_name='bli'), mode='w')
 
-    if all_data:
-        # 儲存資料
-        storage = JSONLHandler()
-        storage.write_items('bli_faq', all_data, mode='w')
-        logger.info(f"✓ BLI 資料已儲存: {len(all_data)} 筆")
+    if count:
+        logger.info(f"✓ BLI 資料已儲存: {count} 筆")
 
         # 建立索引
-        index_mgr = IndexManager()
-        index_mgr.build_index('bli_faq', all_data)
+        index_mgr.build_index('bli_faq', storage.stream_read('bli_faq'))
         logger.info("✓ BLI 索引已建立")
 
-    return len(all_data) if all_data else 0
+    return count
 
 
 def main():
@@ -116,22 +120,26 @@ def main():
     parser = argparse.ArgumentParser(description='全量爬取 FAQ 資料')
     parser.add_argument('--source', choices=['mol', 'osha', 'bli', 'all'],
                         default='all', help='指定爬取來源')
+    parser.add_argument('--parallel', action='store_true',
+                        help='同時爬取多個來源（各來源主機不同，互不影響）')
     args = parser.parse_args()
 
     logger.info("=" * 70)
     logger.info("勞動法規 FAQ 全量爬取")
     logger.info("=" * 70)
 
-    results = {}
-
-    if args.source in ['mol', 'all']:
-        results['mol'] = crawl_mol()
-
-    if args.source in ['osha', 'all']:
-        results['osha'] = crawl_osha()
-
-    if args.source in ['bli', 'all']:
-        results['bli'] = crawl_bli()
+    tasks = [
+        (source, fn)
+        for source, fn in [('mol', crawl_mol), ('osha', crawl_osha), ('bli', crawl_bli)]
+        if args.source in [source, 'all']
+    ]
+
+    if args.parallel and len(tasks) > 1:
+        with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+            futures = {source: executor.submit(fn) for source, fn in tasks}
+            results = {source: future.result() for source, future in futures.items()}
+    else:
+        results = {source: fn() for source, fn in tasks}
 
     # 總結
     logger.info("\n" + "=" * 70)
@@ -2,6 +2,7 @@
 """測試勞動部常見問答爬蟲"""
 
 import sys
+from collections import Counter
 from pathlib import Path
 
 # 加入專案根目錄到 sys.path
@@ -66,28 +67,27 @@ def main():
 
     if items:
         # 統計分類
-        categories = {}
-        for item in items:
-            cat = item.get('category', 'unknown')
-            categories[cat] = categories.get(cat, 0) + 1
+        categories = Counter(item.get('category', 'unknown') for item in items)
 
         logger.info("\n分類分布:")
-        for cat, count in sorted(categories.items(), key=lambda x: x[1], reverse=True):
+        for cat, count in categories.most_common():
             logger.info(f"  {cat or 'None'}: {count} 筆")
 
         # 統計次分類
-        subcategories = {}
-        for item in items:
-            subcat = item.get('subcategory', 'unknown')
-            subcategories[subcat] = subcategories.get(subcat, 0) + 1
+        subcategories = Counter(item.get('subcategory', 'unknown') for item in items)
 
         logger.info("\n次分類分布:")
-        for subcat, count in sorted(subcategories.items(), key=lambda x: x[1], reverse=True)[:10]:
+        for subcat, count in subcategories.most_common(10):
             logger.info(f"  {subcat or 'None'}: {count} 筆")
 
-        # 統計相關法規
-        total_laws = sum(len(item.get('related_laws', [])) for item in items)
-        items_with_laws = sum(1 for item in items if item.get('related_laws'))
+        # 統計相關法規（單次走訪同時計算總數與有法規的筆數）
+        total_laws = 0
+        items_with_laws = 0
+        for item in items:
+            laws = item.get('related_laws')
+            if laws:
+                total_laws += len(laws)
+                items_with_laws += 1
 
         logger.info(f"\n相關法規統計:")
         logger.info(f"  有相關法規的問答: {items_with_laws}/{len(items)} ({items_with_laws/len(items)*100:.1f}%)")
@@ -16,7 +16,12 @@
 import os
 import sys
 import time
-import json
+import asyncio
+import atexit
+import fnmatch
+import hashlib
+import io
+import mmap
 import argparse
 from pathlib import Path
 from datetime import datetime
@@ -28,16 +33,21 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 from loguru import logger
 
-# 設定日誌
+# 設定日誌（enqueue=True 交由背景執行緒寫出，不阻塞上傳；終端只顯示 INFO 以上）
 log_file = PROJECT_ROOT / 'logs' / f'upload_faq_{datetime.now().strftime("%Y%m%d_%H%M%S")}.log'
 log_file.parent.mkdir(parents=True, exist_ok=True)
+logger.remove()
+logger.add(sys.stderr, level="INFO", enqueue=True)
 logger.add(
     str(log_file),
     rotation="50 MB",
     retention="7 days",
-    level="DEBUG"
+    level="DEBUG",
+    enqueue=True
 )
 
+from src.utils.helpers import backoff_delay, json_dumps, json_loads
+
 try:
     from google import genai
     from google.genai import types
@@ -53,12 +63,17 @@ load_dotenv(PROJECT_ROOT / '.env')
 class FAQGeminiUploader:
     """勞動 FAQ Gemini 上傳器"""
 
+    # 累積多少筆上傳結果，或距上次寫入超過幾秒後寫入 manifest
+    MANIFEST_SAVE_EVERY = 25
+    MANIFEST_SAVE_INTERVAL = 5.0
+
     def __init__(
         self,
         api_key: Optional[str] = None,
         store_name: str = 'labor-faq',
         max_retries: int = 3,
-        retry_delay: float = 2.0
+        retry_delay: float = 2.0,
+        concurrency: int = 8
     ):
         """初始化上傳器"""
         self.api_key = api_key or os.getenv('GEMINI_API_KEY')
@@ -70,6 +85,7 @@ class FAQGeminiUploader:
         self.store_id = None
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        self.concurrency = max(1, concurrency)
 
         # 統計
         self.stats = {
@@ -85,27 +101,142 @@ class FAQGeminiUploader:
         self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
         self.manifest = self._load_manifest()
 
+        # 反向索引：檔案路徑 -> 目前歸屬的內容雜湊
+        self._path_keys = {
+            path: key
+            for key, info in self.manifest['uploaded'].items()
+            for path in info.get('paths', [])
+        }
+
+        # Manifest 批次寫入：累積 MANIFEST_SAVE_EVERY 筆變更或超過 MANIFEST_SAVE_INTERVAL 秒才寫檔，結束時補寫
+        self._manifest_pending = 0
+        self._last_manifest_save = time.monotonic()
+        atexit.register(self._save_manifest, force=True)
+
         logger.info(f"FAQGeminiUploader 初始化: store={store_name}")
 
     def _load_manifest(self) -> Dict[str, Any]:
-        """載入上傳狀態"""
-        if self.manifest_file.exists():
+        """載入上傳狀態（以 mmap 唯讀映射檔案交給 JSON 解析器，不另外複製內容）"""
+        if self.manifest_file.exists() and self.manifest_file.stat().st_size > 0:
             try:
-                with open(self.manifest_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                with open(self.manifest_file, 'rb') as f, \
+                        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                        memoryview(mm) as view:
+                    manifest = json_loads(view)
+                return self._migrate_manifest(manifest)
             except Exception as e:
                 logger.warning(f"載入 manifest 失敗: {e}")
         return {'uploaded': {}, 'store_id': None}
 
-    def _save_manifest(self):
-        """儲存上傳狀態"""
+    @staticmethod
+    def _content_key(filepath: Path) -> str:
+        """
+        計算檔案內容雜湊，作為 manifest 的索引鍵
+
+        Args:
+            filepath: 檔案路徑
+
+        Returns:
+            blake2b 十六進位雜湊值
+        """
+        return hashlib.blake2b(filepath.read_bytes(), digest_size=16).hexdigest()
+
+    def _migrate_manifest(self, manifest: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        將舊版以路徑為鍵的 manifest 轉為以內容雜湊為鍵
+
+        Args:
+            manifest: 載入的 manifest
+
+        Returns:
+            uploaded 以內容雜湊為鍵、每筆記錄附 paths 的 manifest
+        """
+        uploaded = {}
+        for key, info in manifest.get('uploaded', {}).items():
+            if 'paths' in info:
+                uploaded[key] = info
+                continue
+
+            # 舊版記錄：鍵為檔案路徑；檔案已不存在則保留路徑作為鍵
+            path = Path(key)
+            content_key = self._content_key(path) if path.exists() else key
+            existing = uploaded.get(content_key)
+            if existing and existing.get('status') == 'success':
+                existing['paths'].append(key)
+                continue
+            uploaded[content_key] = {**info, 'paths': [key]}
+
+        manifest['uploaded'] = uploaded
+        return manifest
+
+    def _detach_path(self, path: str, content_key: str):
+        """
+        檔案內容已變更時，將路徑從舊內容的記錄中移除
+
+        舊記錄不再有任何路徑時標記為 stale：遠端檔案已無對應的本地檔案，
+        不再列入 mapping，也不會因內容雜湊相同而被跳過
+
+        Args:
+            path: 檔案路徑
+            content_key: 檔案目前的內容雜湊
+        """
+        old_key = self._path_keys.get(path)
+        if old_key is None or old_key == content_key:
+            return
+
+        del self._path_keys[path]
+        old_info = self.manifest['uploaded'].get(old_key)
+        if old_info and path in old_info['paths']:
+            old_info['paths'].remove(path)
+            if not old_info['paths'] and old_info.get('status') == 'success':
+                old_info['status'] = 'stale'
+                logger.info(f"內容已變更，舊檔案標記為 stale: {old_info.get('file_id')} ({path})")
+            self._manifest_pending += 1
+
+    def _assign_path(self, path: str, content_key: str):
+        """
+        將檔案路徑歸屬到 content_key 的記錄，並從舊內容的記錄中移除
+
+        Args:
+            path: 檔案路徑
+            content_key: 檔案目前的內容雜湊
+        """
+        self._detach_path(path, content_key)
+        self._path_keys[path] = content_key
+
+        info = self.manifest['uploaded'].get(content_key)
+        if info is not None and path not in info['paths']:
+            info['paths'].append(path)
+            self._manifest_pending += 1
+
+    def _save_manifest(self, force: bool = False):
+        """
+        儲存上傳狀態
+
+        Args:
+            force: 是否強制寫檔；否則只在累積筆數或間隔時間達門檻時寫入
+        """
+        if not force:
+            if self._manifest_pending == 0:
+                return
+            elapsed = time.monotonic() - self._last_manifest_save
+            if (self._manifest_pending < self.MANIFEST_SAVE_EVERY
+                    and elapsed < self.MANIFEST_SAVE_INTERVAL):
+                return
+
         try:
             self.manifest['store_id'] = self.store_id
-            with open(self.manifest_file, 'w', encoding='utf-8') as f:
-                json.dump(self.manifest, f, indent=2, ensure_ascii=False)
+            self.manifest_file.write_bytes(json_dumps(self.manifest, indent=True))
+            self._manifest_pending = 0
+            self._last_manifest_save = time.monotonic()
         except Exception as e:
             logger.error(f"儲存 manifest 失敗: {e}")
 
+    def _record_manifest_change(self):
+        """記錄一筆 manifest 變更，達門檻時才實際寫檔"""
+        self._manifest_pending += 1
+        self._save_manifest()
+
     def get_or_create_store(self) -> str:
         """取得或建立 File Search Store"""
         try:
@@ -123,7 +254,7 @@ class FAQGeminiUploader:
                 if store.display_name == self.store_name:
                     self.store_id = store.name
                     logger.info(f"找到現有 Store: {self.store_id}")
-                    self._save_manifest()
+                    self._save_manifest(force=True)
                     return self.store_id
 
             # 建立新 Store
@@ -135,7 +266,7 @@ class FAQGeminiUploader:
             )
             self.store_id = store.name
             logger.info(f"Store 建立成功: {self.store_id}")
-            self._save_manifest()
+            self._save_manifest(force=True)
 
             return self.store_id
 
@@ -143,13 +274,22 @@ class FAQGeminiUploader:
             logger.error(f"取得/建立 Store 失敗: {e}")
             raise
 
-    def upload_file_to_store(
+    async def upload_file_to_store(
         self,
         filepath: str,
         display_name: Optional[str] = None,
-        delay: float = 3.0
+        delay: float = 3.0,
+        content_key: Optional[str] = None
     ) -> bool:
-        """上傳單一檔案到 Store (帶重試)"""
+        """
+        上傳單一檔案到 Store (帶重試)
+
+        genai SDK 為同步 API，以 asyncio.to_thread 移出事件迴圈；
+        統計與 manifest 只在事件迴圈執行緒中更新，不需加鎖。
+        manifest 以內容雜湊 content_key 為鍵，未提供時由檔案內容計算。
+        delay 為每個檔案上傳完成後、加入 Store (import_file) 前的等待秒數，
+        不是檔案之間的間隔；檔案之間由 self.concurrency 控制同時上傳數。
+        """
         filepath_obj = Path(filepath)
 
         if not filepath_obj.exists():
@@ -157,6 +297,12 @@ class FAQGeminiUploader:
             self.stats['failed_files'] += 1
             return False
 
+        if content_key is None:
+            content_key = self._content_key(filepath_obj)
+
+        # 小檔一次讀入記憶體，重試時重複使用，不需再讀檔
+        data = filepath_obj.read_bytes()
+
         if not display_name:
             display_name = filepath_obj.name
 
@@ -167,37 +313,33 @@ class FAQGeminiUploader:
                 if attempt == 0:
                     logger.debug(f"上傳: {display_name}")
                 else:
-                    logger.info(f"重試 ({attempt + 1}/{self.max_retries}): {display_name}")
+                    logger.debug(f"重試 ({attempt + 1}/{self.max_retries}): {display_name}")
 
-                with open(filepath, 'rb') as f:
-                    file_obj = self.client.files.upload(
-                        file=f,
-                        config=types.UploadFileConfig(
-                            display_name=display_name,
-                            mime_type='text/plain'
-                        )
-                    )
+                file_obj = await asyncio.to_thread(self._upload_file, data, display_name)
 
                 # 等待後加入 Store
-                time.sleep(delay)
+                await asyncio.sleep(delay)
 
-                self.client.file_search_stores.import_file(
+                await asyncio.to_thread(
+                    self.client.file_search_stores.import_file,
                     file_search_store_name=self.store_id,
                     file_name=file_obj.name
                 )
 
                 # 更新統計
                 self.stats['uploaded_files'] += 1
-                self.stats['total_bytes'] += filepath_obj.stat().st_size
+                self.stats['total_bytes'] += len(data)
 
-                # 記錄到 manifest
-                self.manifest['uploaded'][str(filepath)] = {
+                # 記錄到 manifest（保留同內容記錄既有的路徑）
+                self.manifest['uploaded'][content_key] = {
                     'file_id': file_obj.name,
+                    'paths': self._existing_paths(content_key),
                     'timestamp': time.time(),
                     'status': 'success',
                     'display_name': display_name
                 }
-                self._save_manifest()
+                self._assign_path(str(filepath), content_key)
+                self._record_manifest_change()
 
                 return True
 
@@ -205,26 +347,43 @@ class FAQGeminiUploader:
                 logger.warning(f"上傳失敗 ({attempt + 1}/{self.max_retries}): {e}")
 
                 if attempt < self.max_retries - 1:
-                    retry_delay = self.retry_delay * (2 ** attempt)
-                    logger.info(f"等待 {retry_delay:.1f} 秒後重試...")
-                    time.sleep(retry_delay)
+                    retry_delay = backoff_delay(attempt, self.retry_delay)
+                    logger.debug(f"等待 {retry_delay:.1f} 秒後重試...")
+                    await asyncio.sleep(retry_delay)
                 else:
                     logger.error(f"上傳失敗 (已重試 {self.max_retries} 次): {filepath}")
                     self.stats['failed_files'] += 1
 
-                    self.manifest['uploaded'][str(filepath)] = {
+                    self.manifest['uploaded'][content_key] = {
                         'file_id': None,
+                        'paths': self._existing_paths(content_key),
                         'timestamp': time.time(),
                         'status': 'failed',
                         'error': str(e)
                     }
-                    self._save_manifest()
+                    self._assign_path(str(filepath), content_key)
+                    self._record_manifest_change()
 
                     return False
 
         return False
 
-    def upload_directory(
+    def _existing_paths(self, content_key: str) -> List[str]:
+        """取得 manifest 中同內容記錄既有的路徑（stale 記錄的路徑已全數移除）"""
+        info = self.manifest['uploaded'].get(content_key)
+        return list(info['paths']) if info else []
+
+    def _upload_file(self, data: bytes, display_name: str):
+        """上傳檔案內容到 Gemini Files（同步，於工作執行緒中執行）"""
+        return self.client.files.upload(
+            file=io.BytesIO(data),
+            config=types.UploadFileConfig(
+                display_name=display_name,
+                mime_type='text/plain'
+            )
+        )
+
+    async def upload_directory(
         self,
         directory: str,
         pattern: str = "*.txt",
@@ -232,7 +391,7 @@ class FAQGeminiUploader:
         skip_existing: bool = True,
         limit: Optional[int] = None
     ) -> Dict[str, Any]:
-        """上傳目錄中的所有檔案"""
+        """上傳目錄中的所有檔案（最多 self.concurrency 個檔案同時上傳，每個檔案上傳後等待 delay 秒再加入 Store）"""
         dir_path = Path(directory)
 
         if not dir_path.exists():
@@ -242,41 +401,78 @@ class FAQGeminiUploader:
         if not self.store_id:
             self.get_or_create_store()
 
-        # 尋找所有檔案
-        all_files = sorted(dir_path.glob(pattern))
+        # 尋找所有檔案（os.scandir 一次取得目錄項目與檔案類型，不需逐檔 stat）
+        with os.scandir(dir_path) as it:
+            all_files = sorted(
+                Path(entry.path) for entry in it
+                if entry.is_file() and fnmatch.fnmatch(entry.name, pattern)
+            )
 
         if limit:
             all_files = all_files[:limit]
 
         self.stats['total_files'] = len(all_files)
 
-        # 過濾已上傳的檔案
+        # 依內容雜湊過濾已上傳的檔案；同一批內容相同的檔案只上傳一次
         files_to_upload = []
+        duplicates: Dict[str, List[str]] = {}
+        uploaded = self.manifest['uploaded']
         for filepath in all_files:
-            if skip_existing and str(filepath) in self.manifest['uploaded']:
-                if self.manifest['uploaded'][str(filepath)].get('status') == 'success':
-                    self.stats['skipped_files'] += 1
-                    continue
-            files_to_upload.append(filepath)
+            content_key = self._content_key(filepath)
+            info = uploaded.get(content_key)
+            if skip_existing and info and info.get('status') == 'success':
+                self._assign_path(str(filepath), content_key)
+                self.stats['skipped_files'] += 1
+                continue
+            # 需重新上傳的檔案先脫離舊內容的記錄，上傳結果確定後再歸屬
+            self._detach_path(str(filepath), content_key)
+            if content_key in duplicates:
+                duplicates[content_key].append(str(filepath))
+                self.stats['skipped_files'] += 1
+                continue
+            duplicates[content_key] = []
+            files_to_upload.append((filepath, content_key))
 
         logger.info(f"找到 {len(all_files)} 個檔案")
         logger.info(f"跳過 {self.stats['skipped_files']} 個已上傳檔案")
         logger.info(f"需上傳 {len(files_to_upload)} 個檔案")
 
-        # 逐一上傳
-        for i, filepath in enumerate(files_to_upload, 1):
-            logger.info(f"[{i}/{len(files_to_upload)}] {filepath.name}")
+        # 並行上傳（以 Semaphore 限制同時上傳數，避免觸發 Gemini 速率限制）
+        semaphore = asyncio.Semaphore(self.concurrency)
+        total = len(files_to_upload)
+        completed = 0
 
-            success = self.upload_file_to_store(str(filepath), delay=delay)
+        async def upload_one(filepath: Path, content_key: str) -> bool:
+            nonlocal completed
+            async with semaphore:
+                success = await self.upload_file_to_store(
+                    str(filepath), delay=delay, content_key=content_key
+                )
 
+            completed += 1
             if success:
-                logger.info(f"✓ [{i}/{len(files_to_upload)}] 成功")
+                logger.info(f"✓ [{completed}/{total}] {filepath.name}")
             else:
-                logger.warning(f"✗ [{i}/{len(files_to_upload)}] 失敗")
+                logger.warning(f"✗ [{completed}/{total}] {filepath.name}")
+            return success
+
+        try:
+            results = await asyncio.gather(
+                *(upload_one(filepath, content_key) for filepath, content_key in files_to_upload),
+                return_exceptions=True
+            )
 
-            # 間隔
-            if i < len(files_to_upload):
-                time.sleep(delay)
+            for (filepath, content_key), result in zip(files_to_upload, results):
+                if isinstance(result, Exception):
+                    logger.error(f"上傳發生未預期錯誤: {filepath} - {result}")
+                    self.stats['failed_files'] += 1
+                # 內容相同的其他檔案共用同一個 Gemini file_id（只併入上傳成功的記錄）
+                info = uploaded.get(content_key)
+                if info and info.get('status') == 'success':
+                    for path in duplicates[content_key]:
+                        self._assign_path(path, content_key)
+        finally:
+            self._save_manifest(force=True)
 
         logger.info("=" * 60)
         logger.info("上傳完成!")
@@ -295,7 +491,8 @@ def main():
     parser = argparse.ArgumentParser(description='上傳勞動 FAQ 到 Gemini')
     parser.add_argument('--test', action='store_true', help='測試模式 (只上傳前 10 筆)')
     parser.add_argument('--limit', type=int, help='限制上傳數量')
-    parser.add_argument('--delay', type=float, default=3.0, help='上傳間隔秒數')
+    parser.add_argument('--delay', type=float, default=3.0, help='每個檔案上傳後、加入 Store 前的等待秒數（非檔案間隔）')
+    parser.add_argument('--concurrency', type=int, default=8, help='同時上傳檔案數')
     parser.add_argument('--store-name', default='labor-faq', help='Store 名稱')
     parser.add_argument('--no-skip', action='store_true', help='不跳過已上傳的檔案')
     args = parser.parse_args()
@@ -311,7 +508,7 @@ def main():
         logger.info("【測試模式】只上傳前 10 筆")
 
     # 初始化上傳器
-    uploader = FAQGeminiUploader(store_name=args.store_name)
+    uploader = FAQGeminiUploader(store_name=args.store_name, concurrency=args.concurrency)
 
     # 上傳目錄
     input_dir = PROJECT_ROOT / 'data' / 'plaintext_optimized' / 'faq_individual'
@@ -322,13 +519,13 @@ def main():
         sys.exit(1)
 
     # 開始上傳
-    stats = uploader.upload_directory(
+    stats = asyncio.run(uploader.upload_directory(
         directory=str(input_dir),
         pattern="*.txt",
         delay=args.delay,
         skip_existing=not args.no_skip,
         limit=limit
-    )
+    ))
 
     # 輸出 mapping 檔案
     mapping_file = PROJECT_ROOT / 'data' / 'faq_gemini_id_mapping.json'
@@ -340,16 +537,16 @@ def main():
         'files': {}
     }
 
-    for filepath, info in uploader.manifest['uploaded'].items():
+    for info in uploader.manifest['uploaded'].values():
         if info.get('status') == 'success':
-            file_id = Path(filepath).stem
-            mapping_data['files'][file_id] = {
-                'gemini_file_id': info['file_id'],
-                'display_name': info.get('display_name', '')
-            }
-
-    with open(mapping_file, 'w', encoding='utf-8') as f:
-        json.dump(mapping_data, f, indent=2, ensure_ascii=False)
+            for filepath in info['paths']:
+                file_id = Path(filepath).stem
+                mapping_data['files'][file_id] = {
+                    'gemini_file_id': info['file_id'],
+                    'display_name': Path(filepath).name
+                }
+
+    mapping_file.write_bytes(json_dumps(mapping_data, indent=True))
 
     logger.info(f"Mapping 檔案已儲存: {mapping_file}")
     logger.info("=" * 60)
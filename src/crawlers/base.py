@@ -1,15 +1,58 @@
 """爬蟲抽象基類"""
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from collections import defaultdict
+from typing import List, Dict, Any, Iterator, Optional, Union
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import urlparse
+import copy
+import hashlib
+import ssl
+import threading
 import requests
+import urllib3
+from requests.adapters import HTTPAdapter
 import time
+from bs4 import BeautifulSoup, Tag
 from loguru import logger
+import lxml.html
+
+from ..utils.helpers import atomic_write, backoff_delay, json_dumps, json_loads, make_id_factory
+
+
+# 不驗證憑證的共用 SSLContext（政府網站憑證問題）；不載入 CA，所有爬蟲與連線共用
+_UNVERIFIED_SSL_CONTEXT = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+_UNVERIFIED_SSL_CONTEXT.check_hostname = False
+_UNVERIFIED_SSL_CONTEXT.verify_mode = ssl.CERT_NONE
+
+
+class _PooledAdapter(HTTPAdapter):
+    """可指定共用 SSLContext 的 HTTPAdapter"""
+
+    def __init__(self, ssl_context: Optional[ssl.SSLContext] = None, **kwargs):
+        # HTTPAdapter.__init__ 會呼叫 init_poolmanager，需先設定
+        self.ssl_context = ssl_context
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.ssl_context is not None:
+            kwargs['ssl_context'] = self.ssl_context
+        super().init_poolmanager(*args, **kwargs)
 
 
 class BaseLaborCrawler(ABC):
     """勞動法規爬蟲抽象基類"""
 
+    # 資料源名稱（對應 config/sources.yaml 與 data/<source_key>/），由子類設定
+    source_key: str = ''
+
+    # HTML 解析器（C 實作的 lxml）與原始位元組的編碼；可由 sources.yaml 依資料源覆寫
+    html_parser: str = 'lxml'
+    html_encoding: str = 'utf-8'
+
     def __init__(self, config: Dict[str, Any]):
         """
         初始化爬蟲
@@ -23,19 +66,52 @@ class BaseLaborCrawler(ABC):
         # 設定 HTTP headers
         http_config = config.get('http', {})
         user_agent = http_config.get('user_agent', 'Mozilla/5.0')
-        self.session.headers.update({'User-Agent': user_agent})
+        self.session.headers.update({
+            'User-Agent': user_agent,
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        })
 
         # 請求參數
         self.timeout = http_config.get('timeout', 30)
         self.request_interval = http_config.get('interval', 2.0)
         self.max_retries = http_config.get('retries', 3)
+        self.retry_delay = http_config.get('retry_delay', 1.0)
+
+        # 詳細頁並行抓取數（1 表示循序抓取）
+        self.concurrency = max(1, int(http_config.get('concurrency', 4)))
+
+        # 連線池（重用 TCP/TLS 連線；重試由 fetch_with_retry 自行處理）
+        # 每個主機最多保留 concurrency 條連線，pool_block 讓超出的請求等待
+        # 既有連線釋出，而不是另開用完即丟的連線
+        self._pool_size = http_config.get('pool_size', 32)
+        self._mount_adapter()
 
-        # 統計資訊
+        # 統計資訊（多執行緒共用，更新時需加鎖）
         self.stats = {
             'total_requests': 0,
             'successful_requests': 0,
             'failed_requests': 0,
         }
+        self._stats_lock = threading.Lock()
+
+        # 各主機上次請求時間（限速用）
+        self._last_request_at: Dict[str, float] = {}
+        self._rate_lock = threading.Lock()
+
+        # 條件式請求快取: url -> {'etag', 'last_modified', 'detail'}
+        data_dir = Path(config.get('storage', {}).get('data_dir', 'data'))
+        cache_dir = data_dir / self.source_key if self.source_key else None
+        self._etag_cache_path = cache_dir / 'etag_cache.json' if cache_dir else None
+        self._etag_cache = self._load_cache(self._etag_cache_path, 'ETag 快取')
+
+        # 列表頁快取: url -> {'hash', 'items'}，內容雜湊相同時沿用上次解析結果
+        self._list_cache_path = cache_dir / 'list_cache.json' if cache_dir else None
+        self._list_cache = self._load_cache(self._list_cache_path, '列表頁快取')
+
+        # 各日期已分配的 ID 流水號與 ID 產生器（每次 crawl_all 開始時以 reset_ids 重置）
+        self.date_counters: Dict[str, int] = defaultdict(int)
+        self._id_factories: Dict[str, Any] = {}
 
     @abstractmethod
     def get_list_url(self, page: int, **kwargs) -> str:
@@ -52,12 +128,12 @@ class BaseLaborCrawler(ABC):
         pass
 
     @abstractmethod
-    def parse_list_page(self, html: str) -> List[Dict[str, Any]]:
+    def parse_list_page(self, html: Union[str, bytes]) -> List[Dict[str, Any]]:
         """
         解析列表頁
 
         Args:
-            html: HTML 內容
+            html: HTML 內容（基類傳入原始位元組，請以 make_soup 或 make_tree 解析）
 
         Returns:
             資料列表（包含 detail_url）
@@ -65,12 +141,12 @@ class BaseLaborCrawler(ABC):
         pass
 
     @abstractmethod
-    def parse_detail_page(self, html: str, list_item: Dict[str, Any]) -> Dict[str, Any]:
+    def parse_detail_page(self, html: Union[str, bytes], list_item: Dict[str, Any]) -> Dict[str, Any]:
         """
         解析詳細頁
 
         Args:
-            html: HTML 內容
+            html: HTML 內容（基類傳入原始位元組，請以 make_soup 或 make_tree 解析）
             list_item: 列表頁的項目資料
 
         Returns:
@@ -78,6 +154,123 @@ class BaseLaborCrawler(ABC):
         """
         pass
 
+    def _mount_adapter(self, ssl_context: Optional[ssl.SSLContext] = None):
+        """
+        掛載連線池 adapter
+
+        Args:
+            ssl_context: 建立 TLS 連線時共用的 SSLContext（None 表示使用預設）
+        """
+        adapter = _PooledAdapter(
+            ssl_context=ssl_context,
+            pool_connections=self._pool_size,
+            pool_maxsize=self.concurrency,
+            pool_block=True,
+            max_retries=0
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def disable_ssl_verify(self):
+        """
+        停用 SSL 憑證驗證（政府網站憑證問題）
+
+        改掛載使用共用 SSLContext 的 adapter，避免每條連線各自建立 context，
+        並關閉 InsecureRequestWarning。
+        """
+        self.session.verify = False
+        self._mount_adapter(ssl_context=_UNVERIFIED_SSL_CONTEXT)
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+    def apply_parser_config(self, source_config: Dict[str, Any]):
+        """
+        套用資料源設定中的 HTML 解析器與編碼
+
+        Args:
+            source_config: 資料源配置（html_parser、encoding，未設定時沿用類別預設）
+        """
+        self.html_parser = source_config.get('html_parser', self.html_parser)
+        self.html_encoding = source_config.get('encoding', self.html_encoding)
+
+    def make_soup(self, html: Union[str, bytes]) -> BeautifulSoup:
+        """
+        建立 BeautifulSoup 物件
+
+        直接解析 response.content 位元組並指定編碼，省去 requests 解碼成
+        str 再由解析器重新處理的往返與編碼偵測。
+
+        Args:
+            html: HTML 內容（str 或原始位元組）
+
+        Returns:
+            BeautifulSoup 物件
+        """
+        if isinstance(html, bytes):
+            return BeautifulSoup(html, self.html_parser, from_encoding=self.html_encoding)
+        return BeautifulSoup(html, self.html_parser)
+
+    @staticmethod
+    def truncate_html(tag: Tag, limit: int = 10000) -> str:
+        """
+        序列化元素並截短，結果等同 str(tag)[:limit]
+
+        逐一序列化子節點，累積長度達 limit 即停止，不必序列化整棵子樹。
+
+        Args:
+            tag: BeautifulSoup 元素
+            limit: 最大字元數
+
+        Returns:
+            截短後的 HTML
+        """
+        if not tag.contents:
+            return str(tag)[:limit]
+
+        # 以不含子節點的同名元素取得開始標籤
+        shell = Tag(
+            name=tag.name,
+            attrs=dict(tag.attrs),
+            builder=tag.builder,
+            namespace=tag.namespace,
+            prefix=tag.prefix
+        ).decode()
+        end_tag = f'</{tag.name}>'
+        start_tag = shell[:-len(end_tag)] if shell.endswith(end_tag) else shell
+
+        parts = [start_tag]
+        size = len(start_tag)
+        for child in tag.contents:
+            if size >= limit:
+                break
+            piece = child.decode() if isinstance(child, Tag) else child.output_ready()
+            parts.append(piece)
+            size += len(piece)
+        else:
+            parts.append(end_tag)
+
+        return ''.join(parts)[:limit]
+
+    def make_tree(self, html: Union[str, bytes]) -> lxml.html.HtmlElement:
+        """
+        建立 lxml 文件樹
+
+        不經過 BeautifulSoup 的樹轉換，直接使用 lxml (libxml2) 的元素樹；
+        適合只需簡單走訪與取文字的頁面（如列表頁表格）。
+
+        Args:
+            html: HTML 內容（str 或原始位元組）
+
+        Returns:
+            根元素 (<html>)；內容為空時返回空的 <html> 元素
+        """
+        if not html or not html.strip():
+            return lxml.html.Element('html')
+
+        if isinstance(html, bytes):
+            parser = lxml.html.HTMLParser(encoding=self.html_encoding)
+            return lxml.html.document_fromstring(html, parser=parser)
+        return lxml.html.document_fromstring(html)
+
     def fetch_with_retry(self, url: str, method: str = 'GET', **kwargs) -> Optional[requests.Response]:
         """
         發送 HTTP 請求並自動重試
@@ -92,7 +285,8 @@ class BaseLaborCrawler(ABC):
         """
         for attempt in range(self.max_retries):
             try:
-                self.stats['total_requests'] += 1
+                self._wait_for_slot(url)
+                self._incr_stat('total_requests')
 
                 # 發送請求
                 if method.upper() == 'GET':
@@ -103,26 +297,145 @@ class BaseLaborCrawler(ABC):
                     raise ValueError(f"不支援的 HTTP 方法: {method}")
 
                 response.raise_for_status()
-                self.stats['successful_requests'] += 1
-
-                # 請求間隔
-                time.sleep(self.request_interval)
+                self._incr_stat('successful_requests')
 
                 return response
 
             except requests.exceptions.RequestException as e:
-                self.stats['failed_requests'] += 1
+                self._incr_stat('failed_requests')
 
                 if attempt == self.max_retries - 1:
                     logger.error(f"請求失敗 (已重試 {self.max_retries} 次): {url} - {e}")
                     return None
 
-                wait_time = 2 ** attempt  # 指數退避
-                logger.warning(f"請求失敗,{wait_time}秒後重試 (第 {attempt + 1}/{self.max_retries} 次): {url}")
+                # 429/503 依 Retry-After 退避，否則指數退避（有上限並加入抖動）
+                wait_time = self._retry_after(e.response) or backoff_delay(attempt, self.retry_delay)
+                logger.warning(f"請求失敗,{wait_time:.1f}秒後重試 (第 {attempt + 1}/{self.max_retries} 次): {url}")
                 time.sleep(wait_time)
 
         return None
 
+    def _wait_for_slot(self, url: str):
+        """
+        依主機限速：只有距離同主機上次請求不足間隔時才等待
+
+        同一主機的請求開始時間至少相隔 request_interval 秒（不論並行數多少）；
+        以預約時段方式避免多執行緒同時判斷後一起送出。
+        """
+        if self.request_interval <= 0:
+            return
+
+        host = urlparse(url).netloc
+
+        with self._rate_lock:
+            now = time.monotonic()
+            slot = max(now, self._last_request_at.get(host, 0.0) + self.request_interval)
+            self._last_request_at[host] = slot
+
+        if slot > now:
+            time.sleep(slot - now)
+
+    @staticmethod
+    def _retry_after(response: Optional[requests.Response]) -> Optional[float]:
+        """
+        解析 429/503 回應的 Retry-After header
+
+        Returns:
+            等待秒數，無法取得時返回 None
+        """
+        if response is None or response.status_code not in (429, 503):
+            return None
+
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    def _incr_stat(self, key: str):
+        """累加請求統計（執行緒安全）"""
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    @staticmethod
+    def _load_cache(path: Optional[Path], name: str) -> Dict[str, Dict[str, Any]]:
+        """
+        載入 JSON 快取檔
+
+        Args:
+            path: 快取檔路徑（None 表示不使用快取）
+            name: 快取名稱（日誌用）
+
+        Returns:
+            快取內容，不存在或讀取失敗時返回空字典
+        """
+        if not path or not path.exists():
+            return {}
+
+        try:
+            return json_loads(path.read_bytes())
+
+        except Exception as e:
+            logger.warning(f"載入{name}失敗: {e}")
+            return {}
+
+    @staticmethod
+    def _save_cache(path: Optional[Path], cache: Dict[str, Dict[str, Any]], name: str):
+        """
+        儲存 JSON 快取檔
+
+        Args:
+            path: 快取檔路徑（None 表示不使用快取）
+            cache: 快取內容
+            name: 快取名稱（日誌用）
+        """
+        if not path:
+            return
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # 原子寫入，爬取中斷時不會留下截斷的快取檔
+            atomic_write(path, json_dumps(cache))
+
+            logger.info(f"{name}已儲存: {path} ({len(cache)} 筆)")
+
+        except Exception as e:
+            logger.error(f"儲存{name}失敗: {e}")
+
+    def save_caches(self):
+        """儲存條件式請求與列表頁快取（爬取結束時呼叫）"""
+        self._save_cache(self._etag_cache_path, self._etag_cache, 'ETag 快取')
+        self._save_cache(self._list_cache_path, self._list_cache, '列表頁快取')
+
+    def _conditional_headers(self, url: str) -> Dict[str, str]:
+        """
+        依快取產生條件式請求 headers
+
+        只有在快取中保有上次解析結果時才送出，否則 304 將無資料可用。
+        """
+        cached = self._etag_cache.get(url)
+        if not cached or not cached.get('detail'):
+            return {}
+
+        headers = {}
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+        return headers
+
     def fetch_detail(self, detail_url: str, list_item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         取得詳細頁資料
@@ -136,33 +449,132 @@ class BaseLaborCrawler(ABC):
         """
         logger.debug(f"爬取詳細頁: {detail_url}")
 
-        response = self.fetch_with_retry(detail_url)
+        headers = self._conditional_headers(detail_url)
+        if headers:
+            response = self.fetch_with_retry(detail_url, headers=headers)
+        else:
+            response = self.fetch_with_retry(detail_url)
 
         if not response:
             logger.error(f"詳細頁請求失敗: {detail_url}")
             return None
 
+        # 304 Not Modified: 詳細頁未變更，以本次的列表項目套上快取的詳細頁欄位
+        if response.status_code == 304:
+            logger.debug(f"詳細頁未變更,沿用快取: {detail_url}")
+            return self._merge_detail_fields(list_item, self._etag_cache[detail_url]['detail'])
+
         # 解析詳細頁
         try:
-            detail = self.parse_detail_page(response.text, list_item)
+            # parse_detail_page 只淺複製 list_item，巢狀欄位（如 metadata）可能被就地修改，
+            # 先保留原始內容供比對
+            original = copy.deepcopy(list_item)
+            detail = self.parse_detail_page(response.content, list_item)
+
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            if etag or last_modified:
+                self._etag_cache[detail_url] = {
+                    'etag': etag,
+                    'last_modified': last_modified,
+                    # 只快取詳細頁解析出的欄位，列表頁欄位於 304 時取自當次的列表項目
+                    'detail': self._detail_fields(original, detail),
+                }
+
             return detail
 
         except Exception as e:
             logger.error(f"詳細頁解析失敗: {detail_url} - {e}")
-            import traceback
-            logger.debug(traceback.format_exc())
+            logger.opt(exception=True).debug(f"詳細頁解析失敗: {detail_url}")
             return None
 
-    def crawl_page(self, page: int, **kwargs) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _detail_fields(list_item: Dict[str, Any], detail: Dict[str, Any]) -> Dict[str, Any]:
         """
-        爬取單頁列表
+        取出詳細頁解析新增或改寫的欄位（巢狀字典只比對一層）
+
+        Args:
+            list_item: 解析前的列表項目
+            detail: 解析後的完整資料
+
+        Returns:
+            與列表項目不同的欄位
+        """
+        fields = {}
+        for key, value in detail.items():
+            original = list_item.get(key)
+            if isinstance(value, dict) and isinstance(original, dict):
+                changed = {k: v for k, v in value.items() if k not in original or original[k] != v}
+                if changed:
+                    fields[key] = changed
+            elif key not in list_item or original != value:
+                fields[key] = value
+        return fields
+
+    @staticmethod
+    def _merge_detail_fields(list_item: Dict[str, Any], fields: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        以目前的列表項目為基礎，套上快取的詳細頁欄位
+
+        Args:
+            list_item: 本次列表頁的項目資料
+            fields: 快取的詳細頁欄位
+
+        Returns:
+            完整的資料
+        """
+        detail = copy.deepcopy(list_item)
+        for key, value in fields.items():
+            if isinstance(value, dict) and isinstance(detail.get(key), dict):
+                detail[key].update(copy.deepcopy(value))
+            else:
+                detail[key] = copy.deepcopy(value)
+        return detail
+
+    def iter_details(self, items: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        並行抓取多筆詳細頁，依列表原順序逐筆產出
+
+        詳細頁彼此獨立，以執行緒池同時送出最多 self.concurrency 個請求，
+        重疊網路等待時間；失敗或缺少 detail_url 的項目會被略過。
+
+        Args:
+            items: 列表頁的項目資料（需包含 detail_url）
+
+        Yields:
+            完整的資料
+        """
+        targets = []
+        for item in items:
+            if not item.get('detail_url'):
+                logger.warning(f"缺少 detail_url: {item.get('question', 'N/A')}")
+                continue
+            targets.append(item)
+
+        def fetch(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            return self.fetch_detail(item['detail_url'], item)
+
+        if self.concurrency <= 1 or len(targets) <= 1:
+            for detail in map(fetch, targets):
+                if detail:
+                    yield detail
+            return
+
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(targets))) as executor:
+            for detail in executor.map(fetch, targets):
+                if detail:
+                    yield detail
+
+    def fetch_list_items(self, page: int, **kwargs) -> Optional[List[Dict[str, Any]]]:
+        """
+        取得並解析單頁列表（內容與上次相同時沿用快取，不重新解析）
 
         Args:
             page: 頁碼
             **kwargs: 其他參數
 
         Returns:
-            該頁的資料列表（包含詳細內容）
+            列表頁的項目資料，請求或解析失敗時返回 None
         """
         url = self.get_list_url(page, **kwargs)
         logger.info(f"爬取列表頁: Page {page}")
@@ -171,35 +583,85 @@ class BaseLaborCrawler(ABC):
 
         if not response:
             logger.error(f"列表頁請求失敗: Page {page}")
-            return []
+            return None
 
-        # 解析列表頁
         try:
-            items = self.parse_list_page(response.text)
-            logger.info(f"列表頁解析成功: Page {page} - 找到 {len(items)} 筆資料")
+            content_hash = hashlib.blake2b(response.content, digest_size=16).hexdigest()
+            cached = self._list_cache.get(url)
+            if cached and cached.get('hash') == content_hash:
+                items = copy.deepcopy(cached['items'])
+                logger.info(f"列表頁未變更,沿用快取: Page {page} - {len(items)} 筆資料")
+            else:
+                items = self.parse_list_page(response.content)
+                self._list_cache[url] = {'hash': content_hash, 'items': copy.deepcopy(items)}
+                logger.info(f"列表頁解析成功: Page {page} - 找到 {len(items)} 筆資料")
+            return items
 
-            # 爬取每個項目的詳細頁面
-            results = []
-            for item in items:
-                detail_url = item.get('detail_url')
-                if not detail_url:
-                    logger.warning(f"缺少 detail_url: {item.get('question', 'N/A')}")
-                    continue
+        except Exception as e:
+            logger.error(f"列表頁解析失敗: Page {page} - {e}")
+            logger.opt(exception=True).debug(f"列表頁解析失敗: Page {page}")
+            return None
 
-                detail = self.fetch_detail(detail_url, item)
-                if detail:
-                    detail['page'] = page
-                    results.append(detail)
+    def crawl_page(self, page: int, **kwargs) -> List[Dict[str, Any]]:
+        """
+        爬取單頁列表
+
+        Args:
+            page: 頁碼
+            **kwargs: 其他參數
+
+        Returns:
+            該頁的資料列表（包含詳細內容）
+        """
+        items = self.fetch_list_items(page, **kwargs)
+        if items is None:
+            return []
+
+        try:
+            # 並行爬取每個項目的詳細頁面
+            results = []
+            for detail in self.iter_details(items):
+                detail['page'] = page
+                results.append(detail)
 
             logger.info(f"✓ 第 {page} 頁完成: {len(results)}/{len(items)} 筆")
             return results
 
         except Exception as e:
             logger.error(f"列表頁解析失敗: Page {page} - {e}")
-            import traceback
-            logger.debug(traceback.format_exc())
+            logger.opt(exception=True).debug(f"列表頁解析失敗: Page {page}")
             return []
 
+    def reset_ids(self):
+        """重置各日期的 ID 流水號（每次全量爬取開始時呼叫）"""
+        self.date_counters = defaultdict(int)
+        self._id_factories = {}
+
+    def assign_id(self, item: Dict[str, Any], source_name: str) -> str:
+        """
+        依資料日期分配唯一 ID 並寫入 item['id']
+
+        日期優先取 updated_date，其次 published_date，皆無時歸入 'unknown'；
+        同一日期的流水號依呼叫順序遞增
+
+        Args:
+            item: 單筆資料
+            source_name: 資料源名稱 (mol, bli, osha)
+
+        Returns:
+            分配的 ID
+        """
+        metadata = item.get('metadata', {})
+        date = metadata.get('updated_date') or metadata.get('published_date') or 'unknown'
+
+        make_id = self._id_factories.get(date)
+        if make_id is None:
+            make_id = self._id_factories[date] = make_id_factory(source_name, date)
+
+        self.date_counters[date] += 1
+        item['id'] = make_id(self.date_counters[date])
+        return item['id']
+
     def crawl_all(
         self,
         start_page: int = 1,
@@ -219,9 +681,8 @@ class BaseLaborCrawler(ABC):
         Returns:
             所有資料列表
         """
-        from ..utils.helpers import generate_id
-
         all_data = []
+        self.reset_ids()
         logger.info(f"開始爬取: 從第 {start_page} 頁開始")
 
         page = start_page
@@ -239,22 +700,14 @@ class BaseLaborCrawler(ABC):
                 logger.info(f"第 {page} 頁無資料,停止爬取")
                 break
 
+            # 隨頁生成唯一 ID，不需在最後再走訪一次全部資料
+            for item in items:
+                self.assign_id(item, source_name)
+
             all_data.extend(items)
             page += 1
 
-        # 生成唯一 ID
-        logger.info(f"生成唯一 ID...")
-        date_counters = {}
-        for item in all_data:
-            date = item.get('metadata', {}).get('updated_date')
-            if not date:
-                date = item.get('metadata', {}).get('published_date', 'unknown')
-
-            if date not in date_counters:
-                date_counters[date] = 0
-            date_counters[date] += 1
-
-            item['id'] = generate_id(source_name, date, date_counters[date])
+        self.save_caches()
 
         logger.info(f"爬取完成: 共 {len(all_data)} 筆資料")
         logger.info(f"請求統計: {self.stats}")
@@ -1,16 +1,51 @@
 """勞保局常見問答爬蟲"""
 
-from typing import List, Dict, Any
-from bs4 import BeautifulSoup
+import re
+from typing import List, Dict, Any, Iterator, Union
 from loguru import logger
 
 from .base import BaseLaborCrawler
+from ..utils.config_loader import ConfigLoader
 from ..utils.helpers import clean_text, parse_date, normalize_url, extract_related_laws
 
+# 對應 CSS 選擇器 div.content ul.multilevel-list 與備用的 div.content ul
+_CONTENT_DIV = "//div[contains(concat(' ', normalize-space(@class), ' '), ' content ')]"
+_MAIN_LIST_XPATH = _CONTENT_DIV + "//ul[contains(concat(' ', normalize-space(@class), ' '), ' multilevel-list ')]"
+_FALLBACK_LIST_XPATH = _CONTENT_DIV + "//ul"
+
+# 詳細頁日期（依優先順序：發布日期、更新日期、任意日期）
+_LABELED_DATE_PATTERNS = [
+    re.compile(r'發布日期[：:]?\s*(\d{4}[-/]\d{2}[-/]\d{2})'),
+    re.compile(r'更新日期[：:]?\s*(\d{4}[-/]\d{2}[-/]\d{2})'),
+]
+_DATE_PATTERNS = _LABELED_DATE_PATTERNS + [
+    re.compile(r'(\d{4}[-/]\d{2}[-/]\d{2})'),
+]
+
+# 詳細頁內容區域候選（單次 select 取得，依 _content_priority 決定優先順序）
+_CONTENT_SELECTOR = 'div.main, div.content, article, main'
+
+
+def _content_priority(elem) -> int:
+    """內容區域候選的優先順序：div.main > div.content > article > main"""
+    if elem.name == 'div':
+        classes = elem.get('class') or []
+        if 'main' in classes:
+            return 0
+        if 'content' in classes:
+            return 1
+    return 2 if elem.name == 'article' else 3
+
+
+# 連結文字看起來像法規名稱（法、辦法、規則、條例、細則；「辦法」已涵蓋於「法」）
+_LAW_KW_RE = re.compile(r'法|規則|條例|細則')
+
 
 class BLIFaqCrawler(BaseLaborCrawler):
     """勞保局常見問答爬蟲（樹狀結構）"""
 
+    source_key = 'bli_faq'
+
     def __init__(self, config: Dict[str, Any]):
         """
         初始化爬蟲
@@ -21,23 +56,19 @@ class BLIFaqCrawler(BaseLaborCrawler):
         super().__init__(config)
 
         # 從配置載入 URL
-        from ..utils.config_loader import ConfigLoader
         config_loader = ConfigLoader()
-        source_config = config_loader.get_source_config('bli_faq')
+        source_config = config_loader.get_source_config(self.source_key)
+        self.apply_parser_config(source_config)
 
         self.list_url = source_config.get('list_url')
         self.base_url = source_config.get('base_url', 'https://www.bli.gov.tw')
 
         # 禁用 SSL 驗證（政府網站憑證問題）
-        self.session.verify = False
-
-        # 禁用警告
-        import urllib3
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        self.disable_ssl_verify()
 
         logger.info("BLIFaqCrawler 初始化成功")
 
-    def parse_tree_structure(self, html: str) -> List[Dict[str, Any]]:
+    def parse_tree_structure(self, html: Union[str, bytes]) -> List[Dict[str, Any]]:
         """
         解析樹狀結構，提取所有 FAQ 項目及其分類
 
@@ -47,35 +78,35 @@ class BLIFaqCrawler(BaseLaborCrawler):
         Returns:
             FAQ 項目列表，包含分類資訊
         """
-        soup = BeautifulSoup(html, 'html.parser')
+        # 樹狀頁有大量巢狀 <li>，直接以 lxml 元素樹走訪，避免 BeautifulSoup 逐節點包裝
+        tree = self.make_tree(html)
         items = []
 
         # 策略：遍歷所有 <li> 元素，構建分類層級
         # 使用遞迴方式解析樹狀結構
 
-        def parse_list_recursive(ul_elem, category_path: List[str] = None):
+        # 當前分類路徑（如 ['勞工保險', '加保問題']），遞迴時 append/pop 共用同一個串列
+        category_path: List[str] = []
+
+        def parse_list_recursive(ul_elem):
             """
             遞迴解析 <ul> 元素
 
             Args:
                 ul_elem: <ul> 元素
-                category_path: 當前分類路徑（如 ['勞工保險', '加保問題']）
             """
-            if category_path is None:
-                category_path = []
-
-            if not ul_elem:
+            if ul_elem is None:
                 return
 
             # 遍歷所有 <li> 子元素
-            for li in ul_elem.find_all('li', recursive=False):
-                # 找 <a> 標籤
-                link = li.find('a', recursive=False)
-                if not link:
+            for li in ul_elem.iterchildren('li'):
+                # 找 <a> 標籤（直接子元素）
+                link = li.find('a')
+                if link is None:
                     continue
 
                 href = link.get('href', '')
-                text = clean_text(link.get_text())
+                text = clean_text(link.text_content())
 
                 if not text:
                     continue
@@ -85,11 +116,12 @@ class BLIFaqCrawler(BaseLaborCrawler):
                 # FAQ：href 是真實的 URL（如 /0017380.html）
                 if 'javascript:void(0)' in href or not href:
                     # 這是分類節點，遞迴處理子節點
-                    sub_ul = li.find('ul', recursive=False)
-                    if sub_ul:
-                        # 將當前分類加入路徑
-                        new_path = category_path + [text]
-                        parse_list_recursive(sub_ul, new_path)
+                    sub_ul = li.find('ul')
+                    if sub_ul is not None:
+                        # 將當前分類加入路徑，處理完子節點後移除
+                        category_path.append(text)
+                        parse_list_recursive(sub_ul)
+                        category_path.pop()
                 else:
                     # 這是 FAQ 項目
                     # 建立完整 URL
@@ -111,13 +143,13 @@ class BLIFaqCrawler(BaseLaborCrawler):
 
         # 找到主要的 FAQ 列表
         # BLI 使用 div.content 內的 ul.multilevel-list
-        main_list = soup.select_one('div.content ul.multilevel-list')
+        main_list = next(iter(tree.xpath(_MAIN_LIST_XPATH)), None)
 
-        if not main_list:
+        if main_list is None:
             # 備用選擇器
-            main_list = soup.select_one('div.content ul')
+            main_list = next(iter(tree.xpath(_FALLBACK_LIST_XPATH)), None)
 
-        if main_list:
+        if main_list is not None:
             logger.debug(f"找到主列表: ul.multilevel-list")
             parse_list_recursive(main_list)
         else:
@@ -139,7 +171,7 @@ class BLIFaqCrawler(BaseLaborCrawler):
         """
         return self.list_url
 
-    def parse_list_page(self, html: str) -> List[Dict[str, Any]]:
+    def parse_list_page(self, html: Union[str, bytes]) -> List[Dict[str, Any]]:
         """
         解析列表頁（樹狀結構頁面）
 
@@ -151,7 +183,7 @@ class BLIFaqCrawler(BaseLaborCrawler):
         """
         return self.parse_tree_structure(html)
 
-    def parse_detail_page(self, html: str, list_item: Dict[str, Any]) -> Dict[str, Any]:
+    def parse_detail_page(self, html: Union[str, bytes], list_item: Dict[str, Any]) -> Dict[str, Any]:
         """
         解析詳細頁
 
@@ -162,16 +194,17 @@ class BLIFaqCrawler(BaseLaborCrawler):
         Returns:
             完整的資料
         """
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = self.make_soup(html)
 
         # 基本資料
         detail = list_item.copy()
 
         try:
-            # 提取問題標題（<h1> 或 <h2> 標籤）
-            question_elem = soup.find('h1')
-            if not question_elem:
-                question_elem = soup.find('h2')
+            # 提取問題標題（<h1> 優先，其次 <h2>；一次走訪取得兩種標籤）
+            headings = soup.find_all(['h1', 'h2'])
+            question_elem = next((h for h in headings if h.name == 'h1'), None)
+            if not question_elem and headings:
+                question_elem = headings[0]
 
             if question_elem:
                 question = clean_text(question_elem.get_text())
@@ -179,25 +212,24 @@ class BLIFaqCrawler(BaseLaborCrawler):
                     detail['question'] = question
 
             # 提取答案內容
-            # 策略：找主要內容區域
-            content_area = None
-
-            # 嘗試多種選擇器
-            for selector in ['div.main', 'div.content', 'article', 'main']:
-                content_area = soup.select_one(selector)
-                if content_area:
-                    break
+            # 策略：找主要內容區域（一次走訪取得所有候選，同優先順序取文件中第一個）
+            candidates = soup.select(_CONTENT_SELECTOR)
+            content_area = min(candidates, key=_content_priority, default=None)
 
             if content_area:
                 # 提取答案文字
                 answer_text = content_area.get_text(separator='\n', strip=True)
 
-                # 清理答案（移除問題部分）
-                if detail.get('question'):
-                    answer_text = answer_text.replace(detail['question'], '', 1).strip()
+                # 清理答案（移除問題部分；問題通常在開頭，先以 startswith 判斷）
+                question = detail.get('question')
+                if question:
+                    if answer_text.startswith(question):
+                        answer_text = answer_text[len(question):].strip()
+                    else:
+                        answer_text = answer_text.replace(question, '', 1).strip()
 
                 # 提取答案 HTML（截短）
-                answer_html = str(content_area)[:10000]
+                answer_html = self.truncate_html(content_area)
 
                 detail['answer'] = {
                     'text': answer_text,
@@ -205,13 +237,15 @@ class BLIFaqCrawler(BaseLaborCrawler):
                 }
 
                 # 提取相關法規連結
+                # 以已解析的 DOM 取得連結，不以正則掃描 answer_html：後者截短至 10000 字，
+                # 且保留實體編碼，會漏掉或誤判較長頁面的法規名稱
                 related_laws = []
                 for link in content_area.find_all('a', href=True):
                     link_text = clean_text(link.get_text())
                     href = link.get('href')
 
                     # 如果連結文字看起來像法規名稱
-                    if any(keyword in link_text for keyword in ['法', '辦法', '規則', '條例', '細則']):
+                    if _LAW_KW_RE.search(link_text):
                         related_laws.append({
                             'name': link_text,
                             'url': normalize_url(href, self.base_url)
@@ -221,9 +255,11 @@ class BLIFaqCrawler(BaseLaborCrawler):
 
                 # 從答案文字中提取相關法規（沒有連結的）
                 law_names = extract_related_laws(answer_text)
+                seen = {law['name'] for law in related_laws}
                 for law_name in law_names:
                     # 避免重複
-                    if not any(law['name'] == law_name for law in related_laws):
+                    if law_name not in seen:
+                        seen.add(law_name)
                         related_laws.append({'name': law_name, 'url': ''})
 
             else:
@@ -232,36 +268,49 @@ class BLIFaqCrawler(BaseLaborCrawler):
                 detail['related_laws'] = []
 
             # 提取發布日期（如果有）
-            # BLI 可能在頁面底部或特定位置顯示日期
-            date_patterns = [
-                r'發布日期[：:]?\s*(\d{4}[-/]\d{2}[-/]\d{2})',
-                r'更新日期[：:]?\s*(\d{4}[-/]\d{2}[-/]\d{2})',
-                r'(\d{4}[-/]\d{2}[-/]\d{2})'
-            ]
-
-            import re
-            page_text = soup.get_text()
-            for pattern in date_patterns:
-                match = re.search(pattern, page_text)
-                if match:
-                    date_str = match.group(1).replace('/', '-')
-                    detail['metadata'] = detail.get('metadata', {})
-                    detail['metadata']['updated_date'] = parse_date(date_str)
-                    break
+            # 先在內容區域內尋找有標示的發布/更新日期；內文中未標示的日期可能是法規或公告日期，
+            # 不在內容區域採用，找不到時改以整頁文字依原優先順序搜尋（BLI 可能在頁面底部顯示日期）
+            match = None
+            if content_area:
+                match = self._search_date(content_area.get_text(), labeled_only=True)
+            if not match:
+                match = self._search_date(soup.get_text())
+            if match:
+                date_str = match.group(1).replace('/', '-')
+                detail['metadata'] = detail.get('metadata', {})
+                detail['metadata']['updated_date'] = parse_date(date_str)
 
         except Exception as e:
             logger.error(f"解析詳細頁失敗: {list_item.get('detail_url')} - {e}")
-            import traceback
-            logger.debug(traceback.format_exc())
+            logger.opt(exception=True).debug(f"解析詳細頁失敗: {list_item.get('detail_url')}")
 
         # 添加來源標記
         detail['source'] = 'bli'
 
         return detail
 
+    @staticmethod
+    def _search_date(text: str, labeled_only: bool = False):
+        """
+        依優先順序（發布日期、更新日期、任意日期）搜尋日期
+
+        Args:
+            text: 頁面文字
+            labeled_only: 只搜尋有「發布日期」「更新日期」標示的日期
+
+        Returns:
+            第一個符合的 Match 物件，皆不符合時返回 None
+        """
+        patterns = _LABELED_DATE_PATTERNS if labeled_only else _DATE_PATTERNS
+        for pattern in patterns:
+            match = pattern.search(text)
+            if match:
+                return match
+        return None
+
     def crawl_all(self, source_name: str = 'bli') -> List[Dict[str, Any]]:
         """
-        爬取所有 FAQ（BLI 使用單一頁面樹狀結構）
+        爬取所有 FAQ 並收集成列表（iter_all 的列表版本）
 
         Args:
             source_name: 資料源名稱
@@ -269,8 +318,20 @@ class BLIFaqCrawler(BaseLaborCrawler):
         Returns:
             所有資料列表
         """
-        from ..utils.helpers import generate_id
+        return list(self.iter_all(source_name))
+
+    def iter_all(self, source_name: str = 'bli') -> Iterator[Dict[str, Any]]:
+        """
+        爬取所有 FAQ（BLI 使用單一頁面樹狀結構），每完成一筆即產出，不在記憶體保留全部資料
+
+        可直接交給 JSONLHandler.write_stream 邊爬邊寫入
 
+        Args:
+            source_name: 資料源名稱
+
+        Yields:
+            已分配 ID 的單筆資料
+        """
         logger.info(f"\n{'='*70}")
         logger.info(f"開始爬取勞保局常見問答")
         logger.info(f"{'='*70}")
@@ -281,47 +342,33 @@ class BLIFaqCrawler(BaseLaborCrawler):
 
         if not response:
             logger.error("主頁請求失敗")
-            return []
+            return
 
         # 2. 解析樹狀結構，獲取所有 FAQ 項目
-        items = self.parse_tree_structure(response.text)
+        items = self.parse_tree_structure(response.content)
 
         if not items:
             logger.warning("未找到任何 FAQ 項目")
-            return []
+            return
 
         logger.info(f"找到 {len(items)} 筆 FAQ")
 
-        # 3. 爬取每個 FAQ 的詳細頁
-        all_data = []
-        for i, item in enumerate(items, 1):
-            logger.info(f"[{i}/{len(items)}] 爬取: {item['question'][:50]}...")
+        # 3. 並行爬取每個 FAQ 的詳細頁（依主機限速由 fetch_with_retry 控制），
+        #    完成時隨即生成唯一 ID
+        self.reset_ids()
+        completed = 0
+        for detail in self.iter_details(items):
+            self.assign_id(detail, source_name)
 
-            # 爬取詳細頁 - fetch_detail 已經呼叫 parse_detail_page 並回傳解析後的 dict
-            detail = self.fetch_detail(item['detail_url'], item)
-            if detail:
-                all_data.append(detail)
-            else:
-                logger.warning(f"詳細頁爬取失敗: {item['detail_url']}")
-
-            # 控制爬取速度
-            if i < len(items):
-                import time
-                time.sleep(self.request_interval)
+            completed += 1
+            logger.info(f"[{completed}/{len(items)}] 完成: {detail['question'][:50]}...")
+            yield detail
 
-        # 4. 生成唯一 ID
-        logger.info(f"\n生成唯一 ID...")
-        date_counters = {}
-        for item in all_data:
-            date = item.get('metadata', {}).get('updated_date', 'unknown')
+        failed = len(items) - completed
+        if failed:
+            logger.warning(f"詳細頁爬取失敗: {failed} 筆")
 
-            if date not in date_counters:
-                date_counters[date] = 0
-            date_counters[date] += 1
+        self.save_caches()
 
-            item['id'] = generate_id(source_name, date, date_counters[date])
-
-        logger.info(f"\n爬取完成: 共 {len(all_data)} 筆資料")
+        logger.info(f"\n爬取完成: 共 {completed} 筆資料")
         logger.info(f"請求統計: {self.stats}")
-
-        return all_data
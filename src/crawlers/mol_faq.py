@@ -1,16 +1,25 @@
 """勞動部常見問答爬蟲"""
 
-from typing import List, Dict, Any
-from bs4 import BeautifulSoup
+import re
+from typing import List, Dict, Any, Union
 from loguru import logger
 
 from .base import BaseLaborCrawler
+from ..utils.config_loader import ConfigLoader
 from ..utils.helpers import clean_text, parse_date, normalize_url, extract_related_laws
 
+# 詳細頁表格中「答案」欄位的標題
+_ANSWER_RE = re.compile(r'答案')
+
+# 連結文字看起來像法規名稱（法、辦法、規則、條例；「辦法」已涵蓋於「法」）
+_LAW_KW_RE = re.compile(r'法|規則|條例')
+
 
 class MOLFaqCrawler(BaseLaborCrawler):
     """勞動部常見問答爬蟲"""
 
+    source_key = 'mol_faq'
+
     def __init__(self, config: Dict[str, Any]):
         """
         初始化爬蟲
@@ -21,19 +30,15 @@ class MOLFaqCrawler(BaseLaborCrawler):
         super().__init__(config)
 
         # 從配置載入 URL
-        from ..utils.config_loader import ConfigLoader
         config_loader = ConfigLoader()
-        source_config = config_loader.get_source_config('mol_faq')
+        source_config = config_loader.get_source_config(self.source_key)
+        self.apply_parser_config(source_config)
 
         self.base_url = source_config.get('base_url', 'https://www.mol.gov.tw')
         self.list_url = source_config.get('list_url')
 
         # 禁用 SSL 驗證（政府網站憑證問題）
-        self.session.verify = False
-
-        # 禁用警告
-        import urllib3
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        self.disable_ssl_verify()
 
         logger.info("MOLFaqCrawler 初始化成功")
 
@@ -50,7 +55,7 @@ class MOLFaqCrawler(BaseLaborCrawler):
         # MOL 使用 URL 參數分頁: ?Page=1&PageSize=10
         return f"{self.list_url}?Page={page}&PageSize=10"
 
-    def parse_list_page(self, html: str) -> List[Dict[str, Any]]:
+    def parse_list_page(self, html: Union[str, bytes]) -> List[Dict[str, Any]]:
         """
         解析列表頁（表格式）
 
@@ -60,39 +65,40 @@ class MOLFaqCrawler(BaseLaborCrawler):
         Returns:
             資料列表
         """
-        soup = BeautifulSoup(html, 'html.parser')
+        # 列表頁只需走訪表格與取文字，直接使用 lxml 元素樹
+        tree = self.make_tree(html)
         items = []
 
         # 找到表格
-        table = soup.find('table')
-        if not table:
+        table = next(tree.iter('table'), None)
+        if table is None:
             logger.warning("未找到表格")
             return []
 
         # 解析表格行（跳過表頭）
-        rows = table.find_all('tr')[1:]  # 跳過第一行表頭
+        rows = list(table.iter('tr'))[1:]  # 跳過第一行表頭
 
         for row in rows:
             try:
-                cells = row.find_all('td')
+                cells = list(row.iter('td'))
                 if len(cells) < 6:
                     continue
 
                 # 提取欄位
                 # 項次、標題、次分類、發布單位、發布日期、更新日期
-                index = clean_text(cells[0].get_text())
+                index = clean_text(cells[0].text_content())
                 title_cell = cells[1]
-                subcategory = clean_text(cells[2].get_text())
-                department = clean_text(cells[3].get_text())
-                published_date_str = clean_text(cells[4].get_text())
-                updated_date_str = clean_text(cells[5].get_text())
+                subcategory = clean_text(cells[2].text_content())
+                department = clean_text(cells[3].text_content())
+                published_date_str = clean_text(cells[4].text_content())
+                updated_date_str = clean_text(cells[5].text_content())
 
                 # 提取標題和連結
-                link = title_cell.find('a')
-                if not link:
+                link = next(title_cell.iter('a'), None)
+                if link is None:
                     continue
 
-                title = clean_text(link.get_text())
+                title = clean_text(link.text_content())
                 href = link.get('href')
                 detail_url = normalize_url(href, self.base_url)
 
@@ -121,7 +127,7 @@ class MOLFaqCrawler(BaseLaborCrawler):
         logger.debug(f"解析列表頁: 找到 {len(items)} 筆資料")
         return items
 
-    def parse_detail_page(self, html: str, list_item: Dict[str, Any]) -> Dict[str, Any]:
+    def parse_detail_page(self, html: Union[str, bytes], list_item: Dict[str, Any]) -> Dict[str, Any]:
         """
         解析詳細頁
 
@@ -132,7 +138,7 @@ class MOLFaqCrawler(BaseLaborCrawler):
         Returns:
             完整的資料
         """
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = self.make_soup(html)
 
         # 基本資料
         detail = list_item.copy()
@@ -146,38 +152,48 @@ class MOLFaqCrawler(BaseLaborCrawler):
 
             # 提取答案內容
             # 查找主要內容區域（根據 WebFetch 分析更新選擇器）
-            content_area = None
+            # 一次走訪取得 <article> 與 <main> 候選，供策略 1 與策略 3 使用
+            landmarks = soup.find_all(['article', 'main'])
 
             # 策略 1: 嘗試找 <article> 標籤
-            content_area = soup.find('article')
+            content_area = next((t for t in landmarks if t.name == 'article'), None)
 
             # 策略 2: 如果沒有 article，找 <h2> 的父容器
             if not content_area and question_elem:
-                # 向上找到包含完整內容的容器（通常是 div 或 main）
-                parent = question_elem.parent
-                while parent and parent.name not in ['body', 'html']:
-                    # 檢查是否包含多個 p 標籤（表示這是內容容器）
-                    if len(parent.find_all('p')) >= 1:
+                # 向上找到包含完整內容的容器（通常是 div 或 main），到 body/html 為止
+                for parent in question_elem.parents:
+                    if parent.name in ('body', 'html'):
+                        break
+                    # 檢查是否包含 p 標籤（表示這是內容容器）；find 找到第一個即停止
+                    if parent.find('p') is not None:
                         content_area = parent
                         break
-                    parent = parent.parent
 
             # 策略 3: 最後嘗試找 main 標籤
             if not content_area:
-                content_area = soup.find('main')
+                content_area = next((t for t in landmarks if t.name == 'main'), None)
 
             if content_area:
+                # 單次走訪內容區域，同時取得第一個 <table> 與所有帶 href 的連結
+                table = None
+                links = []
+                for elem in content_area.descendants:
+                    if elem.name == 'a':
+                        if elem.get('href') is not None:
+                            links.append(elem)
+                    elif elem.name == 'table' and table is None:
+                        table = elem
+
                 # 優先從 <table> 的「答案」欄位提取（更精確，無雜訊）
+                # answer_source 為最終採用的答案元素，HTML 只對它序列化一次
                 answer_text = ''
-                answer_html = ''
+                answer_source = None
 
-                table = content_area.find('table')
                 if table:
                     # 找到「答案」的 th，使用正則表達式匹配
-                    import re
                     answer_th = None
                     for th in table.find_all('th'):
-                        if re.search(r'答案', th.get_text()):
+                        if _ANSWER_RE.search(th.get_text()):
                             answer_th = th
                             break
 
@@ -187,16 +203,23 @@ class MOLFaqCrawler(BaseLaborCrawler):
                         if answer_td:
                             # 提取純文字（從 <p> 或直接從 <td>）
                             answer_text = answer_td.get_text(separator='\n', strip=True)
-                            answer_html = str(answer_td)[:10000]
+                            if answer_text:
+                                answer_source = answer_td
 
                 # 如果沒有找到 table 或答案欄位，使用整個內容區域
-                if not answer_text:
+                if answer_source is None:
                     answer_text = content_area.get_text(separator='\n', strip=True)
-                    answer_html = str(content_area)[:10000]
+                    answer_source = content_area
+
+                    # 清理答案（移除問題部分；問題通常在開頭，先以 startswith 判斷）
+                    question = detail.get('question')
+                    if question:
+                        if answer_text.startswith(question):
+                            answer_text = answer_text[len(question):].strip()
+                        else:
+                            answer_text = answer_text.replace(question, '', 1).strip()
 
-                    # 清理答案（移除問題部分）
-                    if detail.get('question'):
-                        answer_text = answer_text.replace(detail['question'], '', 1).strip()
+                answer_html = self.truncate_html(answer_source)
 
                 detail['answer'] = {
                     'text': answer_text,
@@ -205,12 +228,12 @@ class MOLFaqCrawler(BaseLaborCrawler):
 
                 # 提取相關法規連結
                 related_laws = []
-                for link in content_area.find_all('a', href=True):
+                for link in links:
                     link_text = clean_text(link.get_text())
                     href = link.get('href')
 
                     # 如果連結文字看起來像法規名稱
-                    if any(keyword in link_text for keyword in ['法', '辦法', '規則', '條例']):
+                    if _LAW_KW_RE.search(link_text):
                         related_laws.append({
                             'name': link_text,
                             'url': normalize_url(href, self.base_url)
@@ -220,9 +243,11 @@ class MOLFaqCrawler(BaseLaborCrawler):
 
                 # 從答案文字中提取相關法規（沒有連結的）
                 law_names = extract_related_laws(answer_text)
+                seen = {law['name'] for law in related_laws}
                 for law_name in law_names:
                     # 避免重複
-                    if not any(law['name'] == law_name for law in related_laws):
+                    if law_name not in seen:
+                        seen.add(law_name)
                         related_laws.append({'name': law_name, 'url': ''})
 
             else:
@@ -252,8 +277,7 @@ class MOLFaqCrawler(BaseLaborCrawler):
 
         except Exception as e:
             logger.error(f"解析詳細頁失敗: {list_item.get('detail_url')} - {e}")
-            import traceback
-            logger.debug(traceback.format_exc())
+            logger.opt(exception=True).debug(f"解析詳細頁失敗: {list_item.get('detail_url')}")
 
         # 添加來源標記
         detail['source'] = 'mol'
@@ -1,16 +1,52 @@
 """職安署常見問答爬蟲"""
 
-from typing import List, Dict, Any
-from bs4 import BeautifulSoup
+import copy
+import re
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Dict, Any, Iterator, Optional, Tuple, Union
+from bs4 import Tag
 from loguru import logger
 
 from .base import BaseLaborCrawler
+from ..utils.config_loader import ConfigLoader
 from ..utils.helpers import clean_text, parse_date, normalize_url, extract_related_laws
 
+# 連結文字看起來像法規名稱（法、辦法、規則、條例、細則；「辦法」已涵蓋於「法」）
+_LAW_KW_RE = re.compile(r'法|規則|條例|細則')
+
+# 列表頁項目的 metadata（發布單位、發布日期、更新日期）
+# 以零寬度前瞻包住各欄位，finditer 逐位置比對而不消耗字元，欄位相連時（發布單位值
+# 後面緊接「更新日期」）仍能各自找到，與分別搜尋三個正則的結果相同
+_RE_META = re.compile(
+    r'(?=發布單位[：:]\s*(?P<dept>[^\s]+)'
+    r'|發布日期[：:]\s*(?P<pub>\d{4}-\d{2}-\d{2})'
+    r'|更新日期[：:]\s*(?P<upd>\d{4}-\d{2}-\d{2}))'
+)
+
+# 本次執行保留的分類頁、列表頁解析結果數量上限（詳細頁不快取）
+PARSED_CACHE_SIZE = 256
+
+# 分類頁中 FAQ 路徑下的連結（路徑過濾交由 XPath 於 lxml 內完成）
+_CATEGORY_LINK_XPATH = '//a[contains(@href, "/48110/48461/48463/")]'
+
+# 分類頁的導覽／功能連結文字
+_NAV_LINK_RE = re.compile('|'.join(map(re.escape, [
+    '回上', '列印', '轉寄', '分享', '首頁', '導覽', 'English', '小', '中', '大', '搜尋', '進階',
+])))
+
+# 列表頁的導覽／功能連結文字
+_LIST_NAV_RE = re.compile('|'.join(map(re.escape, [
+    '回上', '列印', '轉寄', '分享', '首頁', '上一頁', '下一頁',
+])))
+
 
 class OSHAFaqCrawler(BaseLaborCrawler):
     """職安署常見問答爬蟲"""
 
+    source_key = 'osha_faq'
+
     def __init__(self, config: Dict[str, Any]):
         """
         初始化爬蟲
@@ -21,117 +57,166 @@ class OSHAFaqCrawler(BaseLaborCrawler):
         super().__init__(config)
 
         # 從配置載入 URL
-        from ..utils.config_loader import ConfigLoader
         config_loader = ConfigLoader()
-        source_config = config_loader.get_source_config('osha_faq')
+        source_config = config_loader.get_source_config(self.source_key)
+        self.apply_parser_config(source_config)
 
         self.base_url = source_config.get('base_url', 'https://www.osha.gov.tw')
         self.index_url = source_config.get('index_url')
 
         # 禁用 SSL 驗證（政府網站憑證問題）
-        self.session.verify = False
-
-        # 禁用警告
-        import urllib3
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        self.disable_ssl_verify()
 
         # 儲存分類資訊
         self.categories = []
 
+        # 本次執行的分類頁連結與列表頁項目: (種類, url) -> 解析結果（LRU，上限 PARSED_CACHE_SIZE）
+        # OSHA 分類樹有交叉連結，同一頁面可能出現在多個分類下；只保留解析結果，不保留 Response
+        self._parsed_cache: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._parsed_cache_lock = threading.Lock()
+
         logger.info("OSHAFaqCrawler 初始化成功")
 
-    def get_categories(self) -> List[Dict[str, str]]:
+    def _cached_parse(self, kind: str, url: str, loader: Callable[[], Any]) -> Any:
         """
-        取得所有分類（遞迴爬取多層結構）
+        取得本次執行已解析的頁面結果，沒有時呼叫 loader 取得（失敗的結果 None 不快取）
+
+        Args:
+            kind: 頁面種類（category、list）
+            url: 頁面 URL
+            loader: 取得並解析頁面的函數
 
         Returns:
-            分類列表 [{'name': '分類名稱', 'url': 'URL', 'type': 'lpsimplelist|post'}, ...]
-            只返回最終的 FAQ 列表頁（lpsimplelist）或單個 FAQ（post）
+            解析結果的複本
         """
-        if self.categories:
-            return self.categories
-
-        logger.info(f"爬取分類頁: {self.index_url}")
-
-        # 遞迴爬取所有層級
-        all_endpoints = []
-        visited_urls = set()
-        endpoint_urls = set()  # 用於去重端點
-
-        def crawl_category_recursive(url: str, parent_name: str = '', depth: int = 0):
-            """遞迴爬取分類頁面"""
-            if url in visited_urls:
-                return
-            if depth > 5:  # 防止無限遞迴
-                logger.warning(f"達到最大遞迴深度: {url}")
-                return
+        key = (kind, url)
+        with self._parsed_cache_lock:
+            if key in self._parsed_cache:
+                self._parsed_cache.move_to_end(key)
+                logger.debug(f"沿用本次已解析的頁面: {url}")
+                return copy.deepcopy(self._parsed_cache[key])
+
+        result = loader()
+        if result is not None:
+            with self._parsed_cache_lock:
+                self._parsed_cache[key] = copy.deepcopy(result)
+                if len(self._parsed_cache) > PARSED_CACHE_SIZE:
+                    self._parsed_cache.popitem(last=False)
+        return result
+
+    def _category_links(self, url: str) -> Optional[List[Tuple[str, str]]]:
+        """
+        取得分類頁中 FAQ 路徑下的連結
 
-            visited_urls.add(url)
+        Args:
+            url: 分類頁 URL
 
-            logger.debug(f"{'  ' * depth}爬取: {url}")
+        Returns:
+            (連結文字, href) 列表，請求失敗時返回 None
+        """
+        def load() -> Optional[List[Tuple[str, str]]]:
             response = self.fetch_with_retry(url)
-
             if not response:
-                logger.warning(f"請求失敗: {url}")
-                return
+                return None
+            return list(self._links(response.content, _CATEGORY_LINK_XPATH))
 
-            soup = BeautifulSoup(response.text, 'html.parser')
+        return self._cached_parse('category', url, load)
 
-            # 找到所有 FAQ 相關的連結
-            all_links = soup.find_all('a', href=True)
+    def fetch_list_items(self, page: int, **kwargs) -> Optional[List[Dict[str, Any]]]:
+        """
+        取得並解析單頁列表；同一次執行中重複的列表頁沿用先前的解析結果
 
-            for link in all_links:
-                href = link.get('href', '')
-                name = clean_text(link.get_text())
+        Args:
+            page: 頁碼
+            **kwargs: 必須包含 category_url
 
-                if not name or not href:
-                    continue
+        Returns:
+            列表頁的項目資料，請求或解析失敗時返回 None
+        """
+        url = self.get_list_url(page, **kwargs)
+        return self._cached_parse('list', url, lambda: super(OSHAFaqCrawler, self).fetch_list_items(page, **kwargs))
 
-                # 過濾非 FAQ 連結
-                if any(keyword in name for keyword in ['回上', '列印', '轉寄', '分享', '首頁', '導覽', 'English', '小', '中', '大', '搜尋', '進階']):
-                    continue
+    def get_categories(self) -> List[Dict[str, str]]:
+        """
+        取得所有分類（逐層爬取多層結構）
 
-                # 只處理 FAQ 路徑下的連結
-                if '/48110/48461/48463/' not in href:
-                    continue
+        Returns:
+            分類列表 [{'name': '分類名稱', 'url': 'URL', 'type': 'lpsimplelist|post'}, ...]
+            只返回最終的 FAQ 列表頁（lpsimplelist）或單個 FAQ（post）
+        """
+        if self.categories:
+            return self.categories
 
-                full_url = normalize_url(href, self.base_url)
-
-                # 根據 URL 類型決定處理方式
-                if 'lpsimplelist' in href:
-                    # 這是 FAQ 列表頁，加入結果（去重）
-                    if full_url not in endpoint_urls:
-                        endpoint_urls.add(full_url)
-                        all_endpoints.append({
-                            'name': name,
-                            'url': full_url,
-                            'type': 'lpsimplelist'
-                        })
-                        logger.debug(f"{'  ' * depth}  [列表] {name}")
-
-                elif href.endswith('/post'):
-                    # 這是單個 FAQ，加入結果（去重）
-                    if full_url not in endpoint_urls:
-                        endpoint_urls.add(full_url)
-                        all_endpoints.append({
-                            'name': name,
-                            'url': full_url,
-                            'type': 'post'
-                        })
-                        logger.debug(f"{'  ' * depth}  [單篇] {name}")
-
-                elif 'nodelist' in href:
-                    # 這是子分類頁，需要遞迴（避免重複遞迴）
-                    if full_url not in visited_urls:
-                        new_parent = f"{parent_name} > {name}" if parent_name else name
-                        logger.debug(f"{'  ' * depth}  [分類] {name} → 遞迴")
-
-                        import time
-                        time.sleep(self.request_interval)
-                        crawl_category_recursive(full_url, new_parent, depth + 1)
-
-        # 從主頁開始遞迴
-        crawl_category_recursive(self.index_url)
+        logger.info(f"爬取分類頁: {self.index_url}")
+
+        # 以佇列逐層（BFS）爬取所有層級
+        all_endpoints = []
+        visited_urls = {self.index_url}  # 已加入佇列的分類頁
+        endpoint_urls = set()  # 用於去重端點
+        queue = deque([(self.index_url, '', 0)])  # (url, 上層分類路徑, 深度)
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while queue:
+                # 同一層的分類頁並行抓取（依主機限速由 fetch_with_retry 控制），
+                # 連結依佇列順序處理，端點順序不受回應先後影響
+                level = [queue.popleft() for _ in range(len(queue))]
+                results = executor.map(lambda node: self._category_links(node[0]), level)
+
+                for (url, parent_name, depth), links in zip(level, results):
+                    logger.debug(f"{'  ' * depth}爬取: {url}")
+
+                    if links is None:
+                        logger.warning(f"請求失敗: {url}")
+                        continue
+
+                    # 找到所有 FAQ 路徑下的連結
+                    for text, href in links:
+                        name = clean_text(text)
+
+                        if not name:
+                            continue
+
+                        # 過濾非 FAQ 連結
+                        if _NAV_LINK_RE.search(name):
+                            continue
+
+                        full_url = normalize_url(href, self.base_url)
+
+                        # 根據 URL 類型決定處理方式
+                        if 'lpsimplelist' in href:
+                            # 這是 FAQ 列表頁，加入結果（去重）
+                            if full_url not in endpoint_urls:
+                                endpoint_urls.add(full_url)
+                                all_endpoints.append({
+                                    'name': name,
+                                    'url': full_url,
+                                    'type': 'lpsimplelist'
+                                })
+                                logger.debug(f"{'  ' * depth}  [列表] {name}")
+
+                        elif href.endswith('/post'):
+                            # 這是單個 FAQ，加入結果（去重）
+                            if full_url not in endpoint_urls:
+                                endpoint_urls.add(full_url)
+                                all_endpoints.append({
+                                    'name': name,
+                                    'url': full_url,
+                                    'type': 'post'
+                                })
+                                logger.debug(f"{'  ' * depth}  [單篇] {name}")
+
+                        elif 'nodelist' in href:
+                            # 這是子分類頁，加入佇列（避免重複爬取）
+                            if full_url in visited_urls:
+                                continue
+                            if depth + 1 > 5:  # 防止無限深入
+                                logger.warning(f"達到最大深度: {full_url}")
+                                continue
+
+                            visited_urls.add(full_url)
+                            new_parent = f"{parent_name} > {name}" if parent_name else name
+                            logger.debug(f"{'  ' * depth}  [分類] {name} → 加入佇列")
+                            queue.append((full_url, new_parent, depth + 1))
 
         logger.info(f"找到 {len(all_endpoints)} 個 FAQ 端點（已去重）")
         for i, ep in enumerate(all_endpoints, 1):
@@ -140,6 +225,20 @@ class OSHAFaqCrawler(BaseLaborCrawler):
         self.categories = all_endpoints
         return all_endpoints
 
+    def _links(self, html: Union[str, bytes], xpath: str = '//a[@href]') -> Iterator[Tuple[str, str]]:
+        """
+        取得頁面上符合 XPath 的 <a> 連結（直接以 lxml 元素樹查詢，不建立 BeautifulSoup）
+
+        Args:
+            html: HTML 內容
+            xpath: 連結的 XPath（須選取帶 href 的 <a>）
+
+        Yields:
+            (連結文字, href) 元組
+        """
+        for link in self.make_tree(html).xpath(xpath):
+            yield link.text_content(), link.get('href')
+
     def get_list_url(self, page: int, **kwargs) -> str:
         """
         生成列表頁 URL（OSHA 使用分類，不是單一列表）
@@ -159,7 +258,7 @@ class OSHAFaqCrawler(BaseLaborCrawler):
         # 目前先假設沒有分頁參數，或者在列表頁中處理
         return category_url
 
-    def parse_list_page(self, html: str) -> List[Dict[str, Any]]:
+    def parse_list_page(self, html: Union[str, bytes]) -> List[Dict[str, Any]]:
         """
         解析列表頁
 
@@ -169,7 +268,7 @@ class OSHAFaqCrawler(BaseLaborCrawler):
         Returns:
             資料列表
         """
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = self.make_soup(html)
         items = []
 
         # 根據 WebFetch 分析：問答項目是 <a> 標籤，包含「發布單位」、「更新日期」等 metadata
@@ -212,7 +311,7 @@ class OSHAFaqCrawler(BaseLaborCrawler):
                 logger.debug(f"通過路徑過濾: {title[:30]}...")
 
                 # 過濾導航連結
-                if any(keyword in title for keyword in ['回上', '列印', '轉寄', '分享', '首頁', '上一頁', '下一頁']):
+                if _LIST_NAV_RE.search(title):
                     continue
 
                 # 建立詳細頁 URL
@@ -232,25 +331,15 @@ class OSHAFaqCrawler(BaseLaborCrawler):
                 if '發布單位' not in item_text and '更新日期' not in item_text and '發布日期' not in item_text:
                     continue
 
-                # 提取發布單位
-                if '發布單位' in item_text:
-                    # 格式：「發布單位：綜合規劃組」
-                    import re
-                    match = re.search(r'發布單位[：:]\s*([^\s]+)', item_text)
-                    if match:
-                        department = match.group(1).strip()
-
-                # 提取發布日期
-                if '發布日期' in item_text:
-                    match = re.search(r'發布日期[：:]\s*(\d{4}-\d{2}-\d{2})', item_text)
-                    if match:
-                        published_date = parse_date(match.group(1))
-
-                # 提取更新日期
-                if '更新日期' in item_text:
-                    match = re.search(r'更新日期[：:]\s*(\d{4}-\d{2}-\d{2})', item_text)
-                    if match:
-                        updated_date = parse_date(match.group(1))
+                # 一次掃描提取發布單位、發布日期、更新日期（各取第一個出現者）
+                # 格式：「發布單位：綜合規劃組」
+                for match in _RE_META.finditer(item_text):
+                    if match['dept'] and not department:
+                        department = match['dept'].strip()
+                    if match['pub'] and published_date is None:
+                        published_date = parse_date(match['pub'])
+                    if match['upd'] and updated_date is None:
+                        updated_date = parse_date(match['upd'])
 
                 item_data = {
                     'question': title,
@@ -271,7 +360,7 @@ class OSHAFaqCrawler(BaseLaborCrawler):
         logger.debug(f"解析列表頁: 找到 {len(items)} 筆資料")
         return items
 
-    def parse_detail_page(self, html: str, list_item: Dict[str, Any]) -> Dict[str, Any]:
+    def parse_detail_page(self, html: Union[str, bytes], list_item: Dict[str, Any]) -> Dict[str, Any]:
         """
         解析詳細頁
 
@@ -282,87 +371,46 @@ class OSHAFaqCrawler(BaseLaborCrawler):
         Returns:
             完整的資料
         """
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = self.make_soup(html)
 
         # 基本資料
         detail = list_item.copy()
 
         try:
-            # 提取問題標題（優先 <h2>，OSHA 使用 h2）
-            question_elem = soup.find('h2')
-            if not question_elem:
-                question_elem = soup.find('h1')
+            # 一次走訪取得標題與 <article>/<main> 候選，供各擷取步驟共用
+            landmarks = soup.find_all(['h1', 'h2', 'article', 'main'])
 
+            question_elem = self._extract_question(landmarks)
             if question_elem:
                 question = clean_text(question_elem.get_text())
                 if question:  # 確保不是空字串
                     detail['question'] = question
 
             # 提取答案內容（與 MOL 類似的策略）
-            content_area = None
-
-            # 策略 1: 嘗試找 <article> 標籤
-            content_area = soup.find('article')
-
-            # 策略 2: 如果沒有 article，找問題標籤的父容器
-            if not content_area and question_elem:
-                parent = question_elem.parent
-                while parent and parent.name not in ['body', 'html']:
-                    # 檢查是否包含答案內容（p 或 ol 標籤）
-                    if len(parent.find_all(['p', 'ol', 'ul'])) >= 1:
-                        content_area = parent
-                        break
-                    parent = parent.parent
-
-            # 策略 3: 最後嘗試找 main 標籤
-            if not content_area:
-                content_area = soup.find('main')
+            content_area = self._extract_content_area(landmarks, question_elem)
 
             if content_area:
                 # 優先從特定區域提取答案
-                answer_text = ''
-                answer_html = ''
-
-                # 嘗試找答案區域（可能在 ol、ul 或 p 標籤中）
-                answer_section = content_area.find(['ol', 'ul', 'div'])
-                if answer_section:
-                    answer_text = answer_section.get_text(separator='\n', strip=True)
-                    answer_html = str(answer_section)[:10000]
-                else:
-                    # 直接使用整個內容區域
-                    answer_text = content_area.get_text(separator='\n', strip=True)
-                    answer_html = str(content_area)[:10000]
-
-                # 清理答案（移除問題部分）
-                if detail.get('question'):
-                    answer_text = answer_text.replace(detail['question'], '', 1).strip()
+                # 嘗試找答案區域（可能在 ol、ul 或 p 標籤中），否則直接使用整個內容區域
+                answer_section = content_area.find(['ol', 'ul', 'div']) or content_area
+                answer_text = answer_section.get_text(separator='\n', strip=True)
+                answer_html = self.truncate_html(answer_section)
+
+                # 清理答案（移除問題部分；問題通常在開頭，先以 startswith 判斷）
+                question = detail.get('question')
+                if question:
+                    if answer_text.startswith(question):
+                        answer_text = answer_text[len(question):].strip()
+                    else:
+                        answer_text = answer_text.replace(question, '', 1).strip()
 
                 detail['answer'] = {
                     'text': answer_text,
                     'html': answer_html
                 }
 
-                # 提取相關法規連結
-                related_laws = []
-                for link in content_area.find_all('a', href=True):
-                    link_text = clean_text(link.get_text())
-                    href = link.get('href')
-
-                    # 如果連結文字看起來像法規名稱
-                    if any(keyword in link_text for keyword in ['法', '辦法', '規則', '條例', '細則']):
-                        related_laws.append({
-                            'name': link_text,
-                            'url': normalize_url(href, self.base_url)
-                        })
-
-                detail['related_laws'] = related_laws
-
-                # 從答案文字中提取相關法規（沒有連結的）
-                law_names = extract_related_laws(answer_text)
-                for law_name in law_names:
-                    # 避免重複
-                    if not any(law['name'] == law_name for law in related_laws):
-                        related_laws.append({'name': law_name, 'url': ''})
+                # 提取相關法規
+                detail['related_laws'] = self._extract_related_laws(content_area, answer_text)
 
             else:
                 logger.warning(f"未找到內容區域: {list_item.get('detail_url')}")
@@ -376,14 +424,143 @@ class OSHAFaqCrawler(BaseLaborCrawler):
 
         except Exception as e:
             logger.error(f"解析詳細頁失敗: {list_item.get('detail_url')} - {e}")
-            import traceback
-            logger.debug(traceback.format_exc())
+            logger.opt(exception=True).debug(f"解析詳細頁失敗: {list_item.get('detail_url')}")
 
         # 添加來源標記
         detail['source'] = 'osha'
 
         return detail
 
+    @staticmethod
+    def _first(landmarks: List[Tag], name: str) -> Optional[Tag]:
+        """取得候選中第一個指定名稱的標籤"""
+        return next((t for t in landmarks if t.name == name), None)
+
+    def _extract_question(self, landmarks: List[Tag]) -> Optional[Tag]:
+        """
+        取得問題標題元素（優先 <h2>，OSHA 使用 h2；其次 <h1>）
+
+        Args:
+            landmarks: 詳細頁的 h1/h2/article/main 候選
+
+        Returns:
+            標題元素或 None
+        """
+        return self._first(landmarks, 'h2') or self._first(landmarks, 'h1')
+
+    def _extract_content_area(self, landmarks: List[Tag], question_elem: Optional[Tag]) -> Optional[Tag]:
+        """
+        取得主要內容區域
+
+        Args:
+            landmarks: 詳細頁的 h1/h2/article/main 候選
+            question_elem: 問題標題元素
+
+        Returns:
+            內容區域元素或 None
+        """
+        # 策略 1: 嘗試找 <article> 標籤
+        content_area = self._first(landmarks, 'article')
+        if content_area:
+            return content_area
+
+        # 策略 2: 如果沒有 article，找問題標籤的父容器
+        if question_elem:
+            for parent in question_elem.parents:
+                if parent.name in ('body', 'html'):
+                    break
+                # 檢查是否包含答案內容（p、ol 或 ul 標籤）；find 找到第一個即停止
+                if parent.find(['p', 'ol', 'ul']) is not None:
+                    return parent
+
+        # 策略 3: 最後嘗試找 main 標籤
+        return self._first(landmarks, 'main')
+
+    def _extract_related_laws(self, content_area: Tag, answer_text: str) -> List[Dict[str, str]]:
+        """
+        提取相關法規（內容區域中的法規連結，以及答案文字中沒有連結的法規名稱）
+
+        Args:
+            content_area: 內容區域元素
+            answer_text: 答案文字
+
+        Returns:
+            相關法規列表 [{'name', 'url'}, ...]
+        """
+        related_laws = []
+        for link in content_area.find_all('a', href=True):
+            link_text = clean_text(link.get_text())
+            href = link.get('href')
+
+            # 如果連結文字看起來像法規名稱
+            if _LAW_KW_RE.search(link_text):
+                related_laws.append({
+                    'name': link_text,
+                    'url': normalize_url(href, self.base_url)
+                })
+
+        # 從答案文字中提取相關法規（沒有連結的）
+        law_names = extract_related_laws(answer_text)
+        seen = {law['name'] for law in related_laws}
+        for law_name in law_names:
+            # 避免重複
+            if law_name not in seen:
+                seen.add(law_name)
+                related_laws.append({'name': law_name, 'url': ''})
+
+        return related_laws
+
+    def _endpoint_list_items(self, endpoint: Dict[str, str]) -> List[Dict[str, Any]]:
+        """
+        取得端點（FAQ 列表頁或單篇 FAQ）待抓取詳細頁的列表項目
+
+        Args:
+            endpoint: 端點資訊 {'name', 'url', 'type'}
+
+        Returns:
+            列表項目（需包含 detail_url）
+        """
+        if endpoint['type'] == 'lpsimplelist':
+            # FAQ 列表頁，取得列表中的所有項目
+            return self.fetch_list_items(
+                page=1,
+                category_url=endpoint['url'],
+                category_name=endpoint['name']
+            ) or []
+
+        if endpoint['type'] == 'post':
+            # 單個 FAQ，直接以端點作為詳細頁
+            return [{
+                'question': endpoint['name'].split(' > ')[-1],  # 取最後一段作為問題
+                'detail_url': endpoint['url'],
+                'category': endpoint['name'],
+            }]
+
+        return []
+
+    def _fetch_endpoint_detail(self, job: Tuple[Dict[str, str], Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        抓取端點下單筆項目的詳細頁，並加上端點的分類資訊
+
+        Args:
+            job: (端點資訊, 列表項目)
+
+        Returns:
+            完整的資料，失敗時返回 None
+        """
+        endpoint, list_item = job
+        try:
+            detail = self.fetch_detail(list_item['detail_url'], list_item)
+        except Exception as e:
+            logger.error(f"詳細頁爬取失敗: {list_item['detail_url']} - {e}")
+            return None
+
+        if detail:
+            if endpoint['type'] == 'lpsimplelist':
+                detail['page'] = 1
+            detail['category'] = endpoint['name']
+        return detail
+
     def crawl_all_categories(
         self,
         source_name: str = 'osha',
@@ -399,72 +576,51 @@ class OSHAFaqCrawler(BaseLaborCrawler):
         Returns:
             所有資料列表
         """
-        from ..utils.helpers import generate_id
-        import time
+        # 解析結果快取只在單次執行內有效
+        self._parsed_cache.clear()
 
-        # 1. 取得所有端點（遞迴爬取多層結構）
+        # 1. 取得所有端點（逐層爬取多層結構）
         endpoints = self.get_categories()
 
         if not endpoints:
             logger.error("無法取得分類資訊")
             return []
 
-        # 2. 爬取每個端點
+        # 2. 所有端點共用同一個執行緒池（依主機限速由 fetch_with_retry 控制）：
+        #    先並行取得各列表頁，再將所有端點的詳細頁一起並行抓取，不在端點內另開執行緒池；
+        #    結果依端點、列表順序合併
         all_data = []
+        total = len(endpoints)
 
-        for i, endpoint in enumerate(endpoints, 1):
-            logger.info(f"\n{'='*70}")
-            logger.info(f"[{i}/{len(endpoints)}] [{endpoint['type']}] {endpoint['name']}")
-            logger.info(f"{'='*70}")
-
-            if endpoint['type'] == 'lpsimplelist':
-                # FAQ 列表頁，爬取列表中的所有項目
-                items = self.crawl_page(
-                    page=1,
-                    category_url=endpoint['url'],
-                    category_name=endpoint['name']
-                )
-
-                # 為每個項目添加分類資訊
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            jobs = []
+            for i, (endpoint, items) in enumerate(zip(endpoints, executor.map(self._endpoint_list_items, endpoints)), 1):
+                logger.info(f"[{i}/{total}] [{endpoint['type']}] {endpoint['name']} - {len(items)} 筆")
                 for item in items:
-                    item['category'] = endpoint['name']
-
-                all_data.extend(items)
-                logger.info(f"✓ 列表頁完成: {len(items)} 筆")
+                    if not item.get('detail_url'):
+                        logger.warning(f"缺少 detail_url: {item.get('question', 'N/A')}")
+                        continue
+                    jobs.append((endpoint, item))
 
-            elif endpoint['type'] == 'post':
-                # 單個 FAQ，直接爬取詳細頁
-                list_item = {
-                    'question': endpoint['name'].split(' > ')[-1],  # 取最後一段作為問題
-                    'detail_url': endpoint['url'],
-                    'category': endpoint['name'],
-                }
-
-                detail = self.fetch_detail(endpoint['url'], list_item)
+            logger.info(f"並行爬取 {len(jobs)} 筆詳細頁...")
+            for (endpoint, _), detail in zip(jobs, executor.map(self._fetch_endpoint_detail, jobs)):
                 if detail:
-                    detail['category'] = endpoint['name']
                     all_data.append(detail)
-                    logger.info(f"✓ 單篇 FAQ 完成")
-                else:
-                    logger.warning(f"✗ 單篇 FAQ 爬取失敗")
+                elif endpoint['type'] == 'post':
+                    logger.warning(f"✗ 單篇 FAQ 爬取失敗: {endpoint['name']}")
 
-            # 控制爬取速度
-            if i < len(endpoints):
-                time.sleep(self.request_interval)
+        failed = len(jobs) - len(all_data)
+        if failed:
+            logger.warning(f"詳細頁爬取失敗: {failed} 筆")
 
         # 3. 生成唯一 ID
         logger.info(f"\n生成唯一 ID...")
-        date_counters = {}
+        self.reset_ids()
         for item in all_data:
-            date = item.get('metadata', {}).get('updated_date')
-            if not date:
-                date = item.get('metadata', {}).get('published_date', 'unknown')
-
-            if date not in date_counters:
-                date_counters[date] = 0
-            date_counters[date] += 1
+            self.assign_id(item, source_name)
 
-            item['id'] = generate_id(source_name, date, date_counters[date])
+        self.save_caches()
+        self._parsed_cache.clear()
 
         logger.info(f"\n爬取完成: 共 {len(all_data)} 筆資料")
         logger.info(f"請求統計: {self.stats}")
@@ -8,12 +8,35 @@
 - 預期效果: -35% 檔案大小, +20% 語義密度, +40-60% 檢索準確度
 """
 
-from typing import Dict, Any, List
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
 from pathlib import Path
 from loguru import logger
-import json
+import os
 import re
 
+from ..utils.helpers import json_loads
+
+# 批次格式化的行程數與每個工作單位的筆數
+FORMAT_WORKERS = os.cpu_count() or 1
+FORMAT_CHUNK_SIZE = 100
+
+# 超過此筆數才使用行程池（筆數少時啟動行程的成本高於格式化本身）
+FORMAT_PARALLEL_THRESHOLD = 5000
+
+# 子行程共用的格式化器與輸出目錄（由 _init_format_worker 於每個子行程設定一次）
+_worker_formatter: Optional['FAQPlainTextOptimizer'] = None
+_worker_output_path: Optional[Path] = None
+
+# 預先編譯的正則（每筆 FAQ、每一行都會用到，避免重複查詢 re 快取）
+_RE_HTML_TAG = re.compile(r'<[^>]+>')
+_RE_SYMS = re.compile(r'^[\-=_\*\#]+$')
+_RE_BLANKS = re.compile(r'\n{3,}')
+_RE_LAW_SUFFIX = re.compile(r'(法|條例|辦法|規則|細則|要點|準則|綱要|規定|標準)$')
+# 句子片段模式：（下稱、下稱、係指、規定，（「（下稱」已涵蓋於「下稱」）
+_RE_INVALID_LAW = re.compile(r'（?下稱|係指|規定，')
+
 
 class FAQPlainTextOptimizer:
     """勞動 FAQ Plain Text 優化格式化器 - 最小化噪音，最大化語義密度"""
@@ -36,6 +59,33 @@ class FAQPlainTextOptimizer:
             '相關連結', '相關網站',
             '無障礙', 'accessibility',
         ]
+        # 合併為單一正則，每行只需掃描一次；已包含其他關鍵字的關鍵字（如「友善列印」
+        # 含「列印」）不影響判斷結果，建立時先剔除以縮短交替分支
+        noise_patterns = [
+            k for k in dict.fromkeys(self.noise_keywords)
+            if not any(other != k and other in k for other in self.noise_keywords)
+        ]
+        self._noise_re = re.compile('|'.join(map(re.escape, noise_patterns)))
+
+        # 法規名稱必須以正式開頭（排除句子片段）
+        self._valid_prefixes = (
+            '勞動', '勞工', '勞保', '勞退', '勞基',
+            '職業', '職安', '職災',
+            '工會', '工廠', '工資',
+            '就業', '就服',
+            '性別', '性平',
+            '保險', '保護',
+            '安全', '衛生',
+            '退休', '資遣',
+            '民', '刑', '行政',
+        )
+
+        # 排除句子片段開頭
+        self._invalid_prefixes = (
+            '依', '按', '次依', '又', '如', '即', '並', '則',
+            '係', '為', '有', '含', '下稱', '上開', '適用',
+            '事業', '雇主', '勞雇', '工作者', '比照',
+        )
 
         # 來源名稱對應
         self.source_names = {
@@ -44,6 +94,9 @@ class FAQPlainTextOptimizer:
             'bli': '勞動部勞工保險局',
         }
 
+        # 標頭行快取: (來源, 主分類, 次分類, 分類路徑) -> 標頭行
+        self._header_cache: Dict[Tuple[str, str, str, str], Tuple[str, ...]] = {}
+
     def format_faq(self, item: Dict[str, Any]) -> str:
         """
         格式化單筆 FAQ 為優化的 Plain Text
@@ -60,32 +113,13 @@ class FAQPlainTextOptimizer:
         Returns:
             優化的 Plain Text 格式文字
         """
-        lines = []
-
         # ===== 來源與分類 (簡潔) =====
-        source = item.get('source', '')
-        source_name = self.source_names.get(source, source)
-        category = item.get('category', '')
-        subcategory = item.get('subcategory', '')
-
-        # 來源標示
-        if source_name:
-            lines.append(f"來源: {source_name}")
-
-        # 分類標示 (合併主次分類)
-        if category:
-            if subcategory and subcategory != category:
-                lines.append(f"分類: {category} > {subcategory}")
-            else:
-                lines.append(f"分類: {category}")
-
-        # 分類路徑 (如果有，通常 BLI 有)
-        category_path = item.get('category_path', '')
-        if category_path and '>' in category_path:
-            lines.append(f"路徑: {category_path}")
-
-        if lines:
-            lines.append("")
+        lines = list(self._format_header(
+            item.get('source', ''),
+            item.get('category', ''),
+            item.get('subcategory', ''),
+            item.get('category_path', ''),
+        ))
 
         # ===== 問題 =====
         question = item.get('question', '')
@@ -135,6 +169,55 @@ class FAQPlainTextOptimizer:
 
         return "\n".join(lines)
 
+    def _format_header(
+        self,
+        source: str,
+        category: str,
+        subcategory: str,
+        category_path: str
+    ) -> Tuple[str, ...]:
+        """
+        產生來源與分類標頭行（同來源、同分類的 FAQ 大量重複，結果快取重用）
+
+        Args:
+            source: 來源代碼
+            category: 主分類
+            subcategory: 次分類
+            category_path: 分類路徑
+
+        Returns:
+            標頭行（非空時結尾含一個空行）
+        """
+        key = (source, category, subcategory, category_path)
+        header = self._header_cache.get(key)
+        if header is not None:
+            return header
+
+        lines = []
+        source_name = self.source_names.get(source, source)
+
+        # 來源標示
+        if source_name:
+            lines.append(f"來源: {source_name}")
+
+        # 分類標示 (合併主次分類)
+        if category:
+            if subcategory and subcategory != category:
+                lines.append(f"分類: {category} > {subcategory}")
+            else:
+                lines.append(f"分類: {category}")
+
+        # 分類路徑 (如果有，通常 BLI 有)
+        if category_path and '>' in category_path:
+            lines.append(f"路徑: {category_path}")
+
+        if lines:
+            lines.append("")
+
+        header = tuple(lines)
+        self._header_cache[key] = header
+        return header
+
     def _clean_text(self, text: str) -> str:
         """
         清理文字，移除多餘空白和特殊字元
@@ -148,16 +231,13 @@ class FAQPlainTextOptimizer:
         if not text:
             return ""
 
-        # 移除 HTML 標籤
-        text = re.sub(r'<[^>]+>', '', text)
-
-        # 移除多餘空白
-        text = re.sub(r'\s+', ' ', text)
-
-        # 移除首尾空白
-        text = text.strip()
+        # 移除 HTML 標籤（大多數標題與法規名稱沒有標籤，先以 in 判斷略過正則）
+        if '<' in text:
+            text = _RE_HTML_TAG.sub('', text)
 
-        return text
+        # 移除多餘空白與首尾空白
+        # str.split() 與 \s 認定的空白字元相同，結果等同 re.sub(r'\s+', ' ', text).strip()
+        return ' '.join(text.split())
 
     def _clean_content(self, text: str) -> str:
         """
@@ -173,43 +253,20 @@ class FAQPlainTextOptimizer:
             return ""
 
         # 移除 HTML 標籤
-        text = re.sub(r'<[^>]+>', '', text)
-
-        # 分行處理
-        lines = text.split('\n')
-        cleaned_lines = []
-        prev_empty = False
-
-        for line in lines:
-            line = line.strip()
-
-            # 跳過空行 (但保留一個)
-            if not line:
-                if not prev_empty:
-                    cleaned_lines.append('')
-                prev_empty = True
-                continue
-
-            # 跳過包含雜訊關鍵字的行
-            if self._is_noise_line(line):
-                continue
-
-            # 跳過單一字元或過短的行 (可能是導航元素)
-            if len(line) <= 2:
-                continue
-
-            # 跳過純符號行
-            if re.match(r'^[\-=_\*\#]+$', line):
-                continue
-
-            cleaned_lines.append(line)
-            prev_empty = False
-
-        # 合併行
-        result = '\n'.join(cleaned_lines)
+        text = _RE_HTML_TAG.sub('', text)
+
+        # 分行處理，保留空行（連續空行稍後合併為一個）並跳過:
+        # - 過短的行 (單一字元等，可能是導航元素)
+        # - 包含雜訊關鍵字的行
+        # - 純符號行
+        noise_search = self._noise_re.search
+        cleaned_lines = [
+            line for line in (raw.strip() for raw in text.split('\n'))
+            if not line or (len(line) > 2 and not noise_search(line) and not _RE_SYMS.match(line))
+        ]
 
-        # 移除過多的連續空行
-        result = re.sub(r'\n{3,}', '\n\n', result)
+        # 合併行，並將連續空行合併為一個
+        result = _RE_BLANKS.sub('\n\n', '\n'.join(cleaned_lines))
 
         return result.strip()
 
@@ -223,7 +280,7 @@ class FAQPlainTextOptimizer:
         Returns:
             True if 是雜訊行
         """
-        return any(keyword in line for keyword in self.noise_keywords)
+        return self._noise_re.search(line) is not None
 
     def _is_valid_law_name(self, name: str) -> bool:
         """
@@ -249,56 +306,100 @@ class FAQPlainTextOptimizer:
             return False
 
         # 必須以法規結尾
-        if not re.search(r'(法|條例|辦法|規則|細則|要點|準則|綱要|規定|標準)$', name):
+        if not _RE_LAW_SUFFIX.search(name):
             return False
 
-        # 必須以正式開頭（排除句子片段）
-        valid_prefixes = [
-            '勞動', '勞工', '勞保', '勞退', '勞基',
-            '職業', '職安', '職災',
-            '工會', '工廠', '工資',
-            '就業', '就服',
-            '性別', '性平',
-            '保險', '保護',
-            '安全', '衛生',
-            '退休', '資遣',
-            '民', '刑', '行政',
-        ]
-
-        # 排除句子片段開頭
-        invalid_prefixes = [
-            '依', '按', '次依', '又', '如', '即', '並', '則',
-            '係', '為', '有', '含', '下稱', '上開', '適用',
-            '事業', '雇主', '勞雇', '工作者', '比照',
-        ]
-
-        # 檢查開頭
-        starts_valid = any(name.startswith(p) for p in valid_prefixes)
-        starts_invalid = any(name.startswith(p) for p in invalid_prefixes)
+        # 檢查開頭（str.startswith 接受 tuple，一次比對所有前綴）
+        starts_valid = name.startswith(self._valid_prefixes)
+        starts_invalid = name.startswith(self._invalid_prefixes)
 
         if starts_invalid:
             return False
 
         if not starts_valid:
             # 如果不是以已知前綴開頭，檢查是否含有無效模式
-            invalid_patterns = [
-                r'（下稱', r'下稱', r'係指', r'規定，',
-            ]
-            if any(re.search(p, name) for p in invalid_patterns):
+            if _RE_INVALID_LAW.search(name):
                 return False
 
         return True
 
+    def _write_one(self, output_path: Path, item: Dict[str, Any]) -> Tuple[str, Optional[str], str, Optional[str]]:
+        """
+        格式化單筆 FAQ 並寫入檔案（不記錄日誌，子行程的日誌設定不一定與主行程相同）
+
+        Args:
+            output_path: 輸出目錄
+            item: FAQ 資料
+
+        Returns:
+            (ID, 檔案路徑, 來源, 錯誤訊息)；成功時錯誤訊息為 None，失敗時檔案路徑為 None
+        """
+        item_id = item.get('id', 'unknown')
+        try:
+            # 格式化單個 FAQ
+            plain_text = self.format_faq(item)
+
+            # 寫入檔案
+            filepath = output_path / f"{item_id}.txt"
+            filepath.write_text(plain_text, encoding='utf-8')
+
+            return item_id, str(filepath), item.get('source', 'unknown'), None
+
+        except Exception as e:
+            return item_id, None, item.get('source', 'unknown'), str(e)
+
+    def _iter_write_results(
+        self,
+        items: Iterable[Dict[str, Any]],
+        output_path: Path
+    ) -> Iterator[Tuple[str, Optional[str], str, Optional[str]]]:
+        """
+        依序格式化並寫入每筆 FAQ，逐筆產出 _write_one 的結果
+
+        超過 FORMAT_PARALLEL_THRESHOLD 筆時分塊交由行程池並行處理，否則在本行程循序處理
+
+        Args:
+            items: FAQ 資料（列表或逐筆產生的迭代器）
+            output_path: 輸出目錄
+
+        Yields:
+            (ID, 檔案路徑, 來源, 錯誤訊息)
+        """
+        items = iter(items)
+        head = list(islice(items, FORMAT_PARALLEL_THRESHOLD + 1))
+
+        if len(head) <= FORMAT_PARALLEL_THRESHOLD or FORMAT_WORKERS <= 1:
+            for item in chain(head, items):
+                yield self._write_one(output_path, item)
+            return
+
+        # 格式化器只在每個子行程初始化時傳送一次，不隨每個區塊 pickle；
+        # 每輪只取 FORMAT_WORKERS 個區塊，避免迭代器一次全部載入記憶體
+        items = chain(head, items)
+        with ProcessPoolExecutor(
+            max_workers=FORMAT_WORKERS,
+            initializer=_init_format_worker,
+            initargs=(self, output_path)
+        ) as executor:
+            while True:
+                batch = list(islice(items, FORMAT_CHUNK_SIZE * FORMAT_WORKERS))
+                if not batch:
+                    break
+
+                chunks = [batch[i:i + FORMAT_CHUNK_SIZE] for i in range(0, len(batch), FORMAT_CHUNK_SIZE)]
+                for results in executor.map(_format_and_write_chunk, chunks):
+                    yield from results
+
     def format_batch(
         self,
-        items: List[Dict[str, Any]],
+        items: Iterable[Dict[str, Any]],
         output_dir: str = 'data/plaintext_optimized/faq_individual'
     ) -> Dict[str, Any]:
         """
         批次格式化 FAQ 為優化的 Plain Text 檔案
 
         Args:
-            items: FAQ 資料列表
+            items: FAQ 資料（列表或逐筆產生的迭代器）
             output_dir: 輸出目錄
 
         Returns:
@@ -310,37 +411,26 @@ class FAQPlainTextOptimizer:
         logger.info(f"開始格式化 FAQ 為優化 Plain Text 檔案...")
         logger.info(f"輸出目錄: {output_path}")
 
-        if not items:
-            logger.warning("沒有 FAQ 資料")
-            return {'total_items': 0, 'created_files': 0, 'output_dir': str(output_path)}
-
+        total_items = 0
         created_files = []
         source_stats = {}
 
-        for item in items:
-            try:
-                # 格式化單個 FAQ
-                plain_text = self.format_faq(item)
-
-                # 建立檔名
-                item_id = item.get('id', 'unknown')
-                filename = f"{item_id}.txt"
-
-                # 寫入檔案
-                filepath = output_path / filename
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    f.write(plain_text)
+        # 日誌一律在主行程記錄（spawn 啟動的子行程不會套用主程式的日誌設定）
+        for item_id, filepath, source, error in self._iter_write_results(items, output_path):
+            total_items += 1
+            if error is not None:
+                logger.error(f"格式化項目失敗: {item_id} - {error}")
+                continue
 
-                created_files.append(str(filepath))
-                logger.debug(f"建立檔案: {filename}")
+            logger.debug(f"建立檔案: {item_id}.txt")
+            created_files.append(filepath)
 
-                # 統計來源
-                source = item.get('source', 'unknown')
-                source_stats[source] = source_stats.get(source, 0) + 1
+            # 統計來源
+            source_stats[source] = source_stats.get(source, 0) + 1
 
-            except Exception as e:
-                logger.error(f"格式化項目失敗: {item.get('id', 'unknown')} - {e}")
-                continue
+        if not total_items:
+            logger.warning("沒有 FAQ 資料")
+            return {'total_items': 0, 'created_files': 0, 'output_dir': str(output_path)}
 
         logger.info(f"完成! 共建立 {len(created_files)} 個優化 Plain Text 檔案")
         logger.info(f"輸出目錄: {output_path}")
@@ -354,7 +444,7 @@ class FAQPlainTextOptimizer:
         logger.info(f"來源統計: {source_stats}")
 
         return {
-            'total_items': len(items),
+            'total_items': total_items,
             'created_files': len(created_files),
             'output_dir': str(output_path),
             'total_size_kb': total_size / 1024,
@@ -364,27 +454,44 @@ class FAQPlainTextOptimizer:
         }
 
 
-# ===== 便捷函數 =====
+def _init_format_worker(formatter: FAQPlainTextOptimizer, output_path: Path):
+    """
+    子行程初始化：保存格式化器與輸出目錄（需定義在模組層級以便 pickle）
 
-def format_all_faq_optimized(
-    sources: List[str] = None,
-    output_dir: str = 'data/plaintext_optimized/faq_individual'
-) -> Dict[str, Any]:
+    Args:
+        formatter: 格式化器
+        output_path: 輸出目錄
     """
-    從所有 FAQ 來源讀取並格式化為優化的 Plain Text
+    global _worker_formatter, _worker_output_path
+    _worker_formatter = formatter
+    _worker_output_path = output_path
+
+
+def _format_and_write_chunk(chunk: List[Dict[str, Any]]) -> List[Tuple[str, Optional[str], str, Optional[str]]]:
+    """
+    格式化並寫入一個區塊的 FAQ（於子行程執行，需定義在模組層級以便 pickle）
 
     Args:
-        sources: 來源列表 (預設: ['mol_faq', 'osha_faq', 'bli_faq'])
-        output_dir: 輸出目錄
+        chunk: FAQ 資料區塊
 
     Returns:
-        統計資訊
+        各筆的 (ID, 檔案路徑, 來源, 錯誤訊息)
     """
-    if sources is None:
-        sources = ['mol_faq', 'osha_faq', 'bli_faq']
+    return [_worker_formatter._write_one(_worker_output_path, item) for item in chunk]
+
 
-    all_items = []
+# ===== 便捷函數 =====
+
+def iter_faq_items(sources: List[str]) -> Iterator[Dict[str, Any]]:
+    """
+    逐筆讀取各 FAQ 來源的 JSONL 資料
+
+    Args:
+        sources: 來源列表
 
+    Yields:
+        FAQ 資料
+    """
     for source in sources:
         jsonl_file = Path(f'data/{source}/raw.jsonl')
         if not jsonl_file.exists():
@@ -393,21 +500,39 @@ def format_all_faq_optimized(
 
         logger.info(f"讀取 {jsonl_file}")
 
-        with open(jsonl_file, 'r', encoding='utf-8') as f:
+        with open(jsonl_file, 'rb') as f:
             for line in f:
                 if line.strip():
-                    all_items.append(json.loads(line))
+                    yield json_loads(line)
 
-        logger.info(f"  - 載入 {len(all_items)} 筆")
 
-    if not all_items:
-        logger.error("沒有讀取到任何 FAQ 資料")
-        return {'total_items': 0, 'created_files': 0}
+def format_all_faq_optimized(
+    sources: List[str] = None,
+    output_dir: str = 'data/plaintext_optimized/faq_individual'
+) -> Dict[str, Any]:
+    """
+    從所有 FAQ 來源讀取並格式化為優化的 Plain Text
+
+    Args:
+        sources: 來源列表 (預設: ['mol_faq', 'osha_faq', 'bli_faq'])
+        output_dir: 輸出目錄
 
-    logger.info(f"總共讀取 {len(all_items)} 筆 FAQ")
+    Returns:
+        統計資訊
+    """
+    if sources is None:
+        sources = ['mol_faq', 'osha_faq', 'bli_faq']
 
+    # 邊讀邊寫，不將所有 FAQ 保留在記憶體
     formatter = FAQPlainTextOptimizer()
-    return formatter.format_batch(all_items, output_dir)
+    stats = formatter.format_batch(iter_faq_items(sources), output_dir)
+
+    if not stats['total_items']:
+        logger.error("沒有讀取到任何 FAQ 資料")
+        return {'total_items': 0, 'created_files': 0}
+
+    logger.info(f"總共讀取 {stats['total_items']} 筆 FAQ")
+    return stats
 
 
 if __name__ == '__main__':
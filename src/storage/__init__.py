@@ -1,6 +1,6 @@
 """儲存模組"""
 
 from .jsonl_handler import JSONLHandler
-from .index_manager import IndexManager
+from .index_manager import IndexManager, build_id_positions, lookup_by_id
 
-__all__ = ['JSONLHandler', 'IndexManager']
+__all__ = ['JSONLHandler', 'IndexManager', 'build_id_positions', 'lookup_by_id']
@@ -1,12 +1,80 @@
 """索引管理模組"""
 
-import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
 from datetime import datetime
-from collections import defaultdict
 from loguru import logger
 
+from ..utils.helpers import atomic_write, json_dumps, json_loads
+
+try:
+    import ijson
+except ImportError:  # 未安裝時退回完整載入索引
+    ijson = None
+
+# 增量索引每累積幾筆寫回一次檔案
+INDEX_FLUSH_EVERY = 50
+
+# 全量建立索引時每個行程處理的區塊大小與行程數
+INDEX_CHUNK_SIZE = 10_000
+INDEX_WORKERS = os.cpu_count() or 1
+
+# 索引檔格式版本（記錄於 index.json 的 index_format；載入時依 by_id 的內容判斷格式）
+# 1（未記錄）: by_id 為 id -> {'line', 'date', 'category'}
+# 2: by_id 為 ids、lines、dates、categories 平行陣列
+INDEX_FORMAT_VERSION = 2
+
+# by_id 的平行陣列欄位
+BY_ID_FIELDS = ('ids', 'lines', 'dates', 'categories')
+
+
+def build_id_positions(by_id: Dict[str, List[Any]]) -> Dict[str, int]:
+    """
+    建立 ID 到 by_id 平行陣列位置的對照表（重複的 ID 以最後寫入者為準）
+
+    Args:
+        by_id: 平行陣列格式的 by_id
+
+    Returns:
+        {id: 位置}
+    """
+    return {item_id: pos for pos, item_id in enumerate(by_id['ids'])}
+
+
+def lookup_by_id(
+    index: Dict[str, Any],
+    item_id: str,
+    positions: Optional[Dict[str, int]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    從索引的 by_id 平行陣列查詢單筆資料的位置
+
+    Args:
+        index: 索引字典
+        item_id: 資料 ID
+        positions: build_id_positions 建立的對照表（重複查詢時傳入，避免每次重建）
+
+    Returns:
+        {'line', 'date', 'category'}，找不到時返回 None
+    """
+    by_id = index['by_id']
+    if positions is None:
+        positions = build_id_positions(by_id)
+
+    pos = positions.get(item_id)
+    if pos is None:
+        return None
+
+    return {
+        'line': by_id['lines'][pos],
+        'date': by_id['dates'][pos],
+        'category': by_id['categories'][pos]
+    }
+
 
 class IndexManager:
     """索引管理器 - 提供快速查詢能力"""
@@ -20,20 +88,51 @@ class IndexManager:
         """
         self.data_dir = Path(data_dir)
 
+        # 索引與 metadata 路徑快取，以及已確認存在的資料源目錄
+        self._index_paths: Dict[str, Path] = {}
+        self._metadata_paths: Dict[str, Path] = {}
+        self._dirs_created: Set[str] = set()
+
+        # 增量更新中的索引: source -> {'index', 'metadata', 'unsaved'}
+        self._pending: Dict[str, Dict[str, Any]] = {}
+
+        # lookup_by_id 用的 by_id 與 ID 位置對照表: source -> (by_id, {id: 位置})
+        self._id_lookup: Dict[str, Tuple[Dict[str, List[Any]], Dict[str, int]]] = {}
+
     def get_index_path(self, source: str) -> Path:
         """取得索引檔案路徑"""
-        return self.data_dir / source / "index.json"
+        path = self._index_paths.get(source)
+        if path is None:
+            path = self._index_paths[source] = self.data_dir / source / "index.json"
+        return path
 
     def get_metadata_path(self, source: str) -> Path:
         """取得 metadata 檔案路徑"""
-        return self.data_dir / source / "metadata.json"
+        path = self._metadata_paths.get(source)
+        if path is None:
+            path = self._metadata_paths[source] = self.data_dir / source / "metadata.json"
+        return path
 
-    def load_index(self, source: str) -> Dict[str, Any]:
+    def _ensure_dir(self, source: str, path: Path):
+        """
+        確保資料源目錄存在（每個資料源只建立一次）
+
+        Args:
+            source: 資料源名稱
+            path: 目錄下的檔案路徑
+        """
+        if source not in self._dirs_created:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._dirs_created.add(source)
+
+    def load_index(self, source: str, strict: bool = False) -> Dict[str, Any]:
         """
         載入索引
 
         Args:
             source: 資料源名稱
+            strict: 索引檔存在但無法載入時拋出例外（之後會寫回索引的呼叫端使用，
+                    避免以空索引覆蓋原本的檔案）；否則返回空索引
 
         Returns:
             索引字典
@@ -45,13 +144,101 @@ class IndexManager:
             return self._create_empty_index()
 
         try:
-            with open(index_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            index = json_loads(index_path.read_bytes())
+            index['by_id'] = self._normalize_by_id(index.get('by_id') or {})
+            index['index_format'] = INDEX_FORMAT_VERSION
+            return index
 
         except Exception as e:
-            logger.error(f"載入索引失敗: {e}")
+            logger.error(f"載入索引失敗: {index_path} - {e}")
+            if strict:
+                raise
             return self._create_empty_index()
 
+    def load_index_section(self, source: str, section: str) -> Any:
+        """
+        只載入索引的單一區段（如 by_date、by_category、by_id）
+
+        安裝 ijson 時以串流方式只解析該區段，其餘區段不建立物件；否則退回完整載入
+
+        Args:
+            source: 資料源名稱
+            section: 區段名稱
+
+        Returns:
+            區段內容，不存在時返回空索引中的預設值
+        """
+        # 尚未寫回的增量更新以記憶體中的索引為準
+        state = self._pending.get(source)
+        if state is not None:
+            return state['index'].get(section)
+
+        index_path = self.get_index_path(source)
+        default = self._create_empty_index().get(section)
+
+        if ijson is None or not index_path.exists():
+            return self.load_index(source).get(section, default)
+
+        try:
+            with open(index_path, 'rb') as f:
+                value = next(ijson.items(f, section), default)
+        except Exception as e:
+            logger.error(f"載入索引區段失敗: {section} - {e}")
+            return default
+
+        if section == 'by_id':
+            value = self._normalize_by_id(value)
+        return value
+
+    def lookup_by_id(self, source: str, item_id: str) -> Optional[Dict[str, Any]]:
+        """
+        查詢單筆資料在 JSONL 中的位置
+
+        第一次查詢時只載入索引的 by_id 區段並建立 ID 位置對照表，之後的查詢直接沿用
+
+        Args:
+            source: 資料源名稱
+            item_id: 資料 ID
+
+        Returns:
+            {'line', 'date', 'category'}，找不到時返回 None
+        """
+        cached = self._id_lookup.get(source)
+        if cached is None:
+            by_id = self.load_index_section(source, 'by_id')
+            cached = self._id_lookup[source] = (by_id, build_id_positions(by_id))
+
+        by_id, positions = cached
+        return lookup_by_id({'by_id': by_id}, item_id, positions)
+
+    @staticmethod
+    def _normalize_by_id(by_id: Dict[str, Any]) -> Dict[str, List[Any]]:
+        """
+        依 by_id 的內容判斷格式：平行陣列（格式 2）直接使用，id -> 字典（格式 1）轉為平行陣列
+
+        Args:
+            by_id: 索引檔中的 by_id
+
+        Returns:
+            平行陣列格式的 by_id
+
+        Raises:
+            ValueError: 無法辨識的 by_id 格式
+        """
+        if all(isinstance(by_id.get(field), list) for field in BY_ID_FIELDS):
+            return by_id
+
+        if not all(isinstance(entry, dict) for entry in by_id.values()):
+            raise ValueError(f"無法辨識的 by_id 格式: {sorted(by_id)[:5]}")
+
+        upgraded = {field: [] for field in BY_ID_FIELDS}
+        for item_id, entry in by_id.items():
+            upgraded['ids'].append(item_id)
+            upgraded['lines'].append(entry.get('line'))
+            upgraded['dates'].append(entry.get('date'))
+            upgraded['categories'].append(entry.get('category'))
+        return upgraded
+
     def save_index(self, source: str, index: Dict[str, Any]):
         """
         儲存索引
@@ -61,11 +248,11 @@ class IndexManager:
             index: 索引字典
         """
         index_path = self.get_index_path(source)
-        index_path.parent.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(source, index_path)
 
         try:
-            with open(index_path, 'w', encoding='utf-8') as f:
-                json.dump(index, f, ensure_ascii=False, indent=2)
+            # 索引只供程式讀取，不縮排以縮小檔案與加快讀寫
+            atomic_write(index_path, json_dumps(index))
 
             logger.info(f"索引已儲存: {index_path}")
 
@@ -90,8 +277,7 @@ class IndexManager:
             return self._create_empty_metadata(source)
 
         try:
-            with open(metadata_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return json_loads(metadata_path.read_bytes())
 
         except Exception as e:
             logger.error(f"載入 metadata 失敗: {e}")
@@ -106,11 +292,10 @@ class IndexManager:
             metadata: metadata 字典
         """
         metadata_path = self.get_metadata_path(source)
-        metadata_path.parent.mkdir(parents=True, exist_ok=True)
+        self._ensure_dir(source, metadata_path)
 
         try:
-            with open(metadata_path, 'w', encoding='utf-8') as f:
-                json.dump(metadata, f, ensure_ascii=False, indent=2)
+            atomic_write(metadata_path, json_dumps(metadata, indent=True))
 
             logger.info(f"Metadata 已儲存: {metadata_path}")
 
@@ -118,74 +303,79 @@ class IndexManager:
             logger.error(f"儲存 metadata 失敗: {e}")
             raise
 
-    def build_index(self, source: str, items: List[Dict[str, Any]]):
+    def build_index(self, source: str, items: Iterable[Dict[str, Any]]):
         """
-        從資料建立索引
+        從資料建立索引（單次走訪，可直接傳入 JSONLHandler.stream_read 的迭代器）
+
+        資料超過 INDEX_CHUNK_SIZE 筆時，先將每筆資料縮減為建立索引所需的欄位，
+        再以多個行程分區塊建立部分索引，依行號順序合併；合併結果與單一行程逐筆建立相同
 
         Args:
             source: 資料源名稱
-            items: 資料列表
+            items: 資料列表或迭代器
         """
-        logger.info(f"開始建立索引: {source} - {len(items)} 筆資料")
+        logger.info(f"開始建立索引: {source}")
+
+        # 全量重建後，尚未寫回的增量更新與查詢用的對照表已無意義
+        self._pending.pop(source, None)
+        self._id_lookup.pop(source, None)
+
+        # 多讀一筆以判斷資料是否超過一個區塊
+        items = iter(items)
+        head = list(islice(items, INDEX_CHUNK_SIZE + 1))
+        items = chain(head, items)
+
+        partial = _empty_partial_index()
+        total_count = 0
+        last_item = None
+
+        if len(head) <= INDEX_CHUNK_SIZE or INDEX_WORKERS <= 1:
+            # 資料量小時不必啟動行程池
+            for line_num, item in enumerate(items, 1):
+                total_count = line_num
+                last_item = item
+                date = self._index_item(partial['by_date'], partial['by_category'], partial['by_id'], item, line_num)
+                if date:
+                    _update_date_range(partial, date)
+        else:
+            # 子行程只需要 (ID, 日期, 分類)，送出前先縮減，不傳送整筆資料（含答案 HTML）；
+            # 每輪只取 INDEX_WORKERS 個區塊，避免迭代器一次全部載入記憶體
+            with ProcessPoolExecutor(max_workers=INDEX_WORKERS) as executor:
+                while True:
+                    batch = list(islice(items, INDEX_CHUNK_SIZE * INDEX_WORKERS))
+                    if not batch:
+                        break
+
+                    last_item = batch[-1]
+                    records = [self._index_fields(item) for item in batch]
+                    jobs = [
+                        (total_count + i + 1, records[i:i + INDEX_CHUNK_SIZE])
+                        for i in range(0, len(records), INDEX_CHUNK_SIZE)
+                    ]
+                    total_count += len(batch)
+                    del batch
+
+                    for result in executor.map(_partial_index, jobs):
+                        _merge_partial_index(partial, result)
 
         index = self._create_empty_index()
-
-        # 按日期索引 (updated_date)
-        by_date = defaultdict(lambda: {'line_numbers': [], 'count': 0})
-
-        # 按分類索引
-        by_category = defaultdict(lambda: {'count': 0, 'latest_line': 0})
-
-        # 按 ID 索引
-        by_id = {}
-
-        for line_num, item in enumerate(items, 1):
-            # 日期索引 (使用 updated_date)
-            date = item.get('metadata', {}).get('updated_date') or item.get('metadata', {}).get('published_date')
-            if date:
-                by_date[date]['line_numbers'].append(line_num)
-                by_date[date]['count'] += 1
-
-            # 分類索引
-            category = item.get('category')
-            if category:
-                by_category[category]['count'] += 1
-                by_category[category]['latest_line'] = line_num
-
-            # ID 索引
-            if 'id' in item:
-                by_id[item['id']] = {
-                    'line': line_num,
-                    'date': date,
-                    'category': category
-                }
-
-        # 轉換為普通字典
-        index['by_date'] = dict(by_date)
-        index['by_category'] = dict(by_category)
-        index['by_id'] = by_id
+        index['by_date'] = partial['by_date']
+        index['by_category'] = partial['by_category']
+        index['by_id'] = partial['by_id']
 
         # 儲存索引
         self.save_index(source, index)
 
         # 更新 metadata
         metadata = self.load_metadata(source)
-        metadata['total_count'] = len(items)
+        metadata['total_count'] = total_count
         metadata['last_index_build'] = datetime.now().isoformat()
 
-        if items:
-            # 日期範圍
-            dates = []
-            for item in items:
-                date = item.get('metadata', {}).get('updated_date') or item.get('metadata', {}).get('published_date')
-                if date:
-                    dates.append(date)
-
-            if dates:
-                metadata['date_range'] = [min(dates), max(dates)]
+        if last_item is not None:
+            if partial['min_date'] is not None:
+                metadata['date_range'] = [partial['min_date'], partial['max_date']]
 
             # 最後一筆
-            last_item = items[-1]
             last_date = last_item.get('metadata', {}).get('updated_date')
             if last_date:
                 metadata['last_crawl_date'] = last_date
@@ -194,14 +384,185 @@ class IndexManager:
 
         self.save_metadata(source, metadata)
 
-        logger.info(f"索引建立完成: {source}")
+        logger.info(f"索引建立完成: {source} - {total_count} 筆資料")
+
+    @staticmethod
+    def _index_fields(item: Dict[str, Any]) -> Tuple[bool, Any, Optional[str], Any]:
+        """
+        取出建立索引所需的欄位
+
+        Args:
+            item: 資料
+
+        Returns:
+            (是否有 ID, ID, 日期, 分類)；日期為 updated_date 優先，其次 published_date
+        """
+        date = item.get('metadata', {}).get('updated_date') or item.get('metadata', {}).get('published_date')
+        category = item.get('category')
+
+        # 日期與分類大量重複，駐留（intern）後各筆的 by_id 共用同一個字串物件
+        if isinstance(date, str):
+            date = sys.intern(date)
+        if isinstance(category, str):
+            category = sys.intern(category)
+
+        return 'id' in item, item.get('id'), date, category
+
+    @staticmethod
+    def _index_record(
+        by_date: Dict[str, Any],
+        by_category: Dict[str, Any],
+        by_id: Dict[str, List[Any]],
+        record: Tuple[bool, Any, Optional[str], Any],
+        line_num: int
+    ) -> Optional[str]:
+        """
+        將 _index_fields 取出的欄位加入日期、分類、ID 索引
+
+        Args:
+            by_date: 日期索引
+            by_category: 分類索引
+            by_id: ID 索引（ids、lines、dates、categories 平行陣列）
+            record: (是否有 ID, ID, 日期, 分類)
+            line_num: 資料在 JSONL 中的行號（從 1 起算）
+
+        Returns:
+            該筆資料的日期
+        """
+        has_id, item_id, date, category = record
+
+        # 以 get 判斷是否已存在，只在新鍵時建立項目（setdefault 每次都會先建好預設值）
+        if date:
+            entry = by_date.get(date)
+            if entry is None:
+                entry = by_date[date] = {'line_numbers': [], 'count': 0}
+            entry['line_numbers'].append(line_num)
+            entry['count'] += 1
+
+        # 分類索引
+        if category:
+            entry = by_category.get(category)
+            if entry is None:
+                entry = by_category[category] = {'count': 0, 'latest_line': 0}
+            entry['count'] += 1
+            entry['latest_line'] = line_num
+
+        # ID 索引：以平行陣列儲存，免去每筆一個小字典的記憶體與序列化成本
+        if has_id:
+            by_id['ids'].append(item_id)
+            by_id['lines'].append(line_num)
+            by_id['dates'].append(date)
+            by_id['categories'].append(category)
+
+        return date
+
+    @staticmethod
+    def _index_item(
+        by_date: Dict[str, Any],
+        by_category: Dict[str, Any],
+        by_id: Dict[str, List[Any]],
+        item: Dict[str, Any],
+        line_num: int
+    ) -> Optional[str]:
+        """
+        將單筆資料加入日期、分類、ID 索引
+
+        Args:
+            by_date: 日期索引
+            by_category: 分類索引
+            by_id: ID 索引（ids、lines、dates、categories 平行陣列）
+            item: 資料
+            line_num: 資料在 JSONL 中的行號（從 1 起算）
+
+        Returns:
+            該筆資料的日期（updated_date 優先，其次 published_date）
+        """
+        return IndexManager._index_record(by_date, by_category, by_id, IndexManager._index_fields(item), line_num)
+
+    def add_to_index(self, source: str, item: Dict[str, Any], line_number: Optional[int] = None):
+        """
+        增量加入單筆資料到索引（搭配 JSONLHandler.append_item，免去全量重建）
+
+        索引與 metadata 只在第一次呼叫時載入，每累積 INDEX_FLUSH_EVERY 筆寫回一次；
+        結束前需呼叫 flush_index 寫回剩餘的更新
+
+        Args:
+            source: 資料源名稱
+            item: 新增的資料
+            line_number: 資料在 JSONL 中的行號（預設為 metadata 的 total_count + 1）
+        """
+        state = self._pending.get(source)
+        if state is None:
+            state = {
+                'index': self.load_index(source, strict=True),
+                'metadata': self.load_metadata(source),
+                'unsaved': 0,
+            }
+            self._pending[source] = state
+
+        index = state['index']
+        metadata = state['metadata']
+
+        if line_number is None:
+            line_number = (metadata.get('total_count') or 0) + 1
+
+        date = self._index_item(index['by_date'], index['by_category'], index['by_id'], item, line_number)
+
+        # 查詢用的對照表指向同一個 by_id 時就地更新，否則捨棄（下次查詢重建）
+        cached = self._id_lookup.get(source)
+        if cached is not None:
+            if cached[0] is index['by_id']:
+                if 'id' in item:
+                    cached[1][item['id']] = len(index['by_id']['ids']) - 1
+            else:
+                del self._id_lookup[source]
+
+        # 更新 metadata
+        metadata['total_count'] = max(metadata.get('total_count') or 0, line_number)
+
+        if date:
+            low, high = metadata.get('date_range') or [None, None]
+            metadata['date_range'] = [
+                date if low is None or date < low else low,
+                date if high is None or date > high else high,
+            ]
+
+        last_date = item.get('metadata', {}).get('updated_date')
+        if last_date:
+            metadata['last_crawl_date'] = last_date
+        if 'id' in item:
+            metadata['last_id'] = item['id']
+
+        state['unsaved'] += 1
+        if state['unsaved'] >= INDEX_FLUSH_EVERY:
+            self.flush_index(source)
+
+    def flush_index(self, source: Optional[str] = None):
+        """
+        寫回增量更新中的索引與 metadata
+
+        Args:
+            source: 資料源名稱（None 表示全部）
+        """
+        sources = [source] if source is not None else list(self._pending)
+
+        for name in sources:
+            state = self._pending.get(name)
+            if not state or not state['unsaved']:
+                continue
+
+            state['metadata']['last_index_build'] = datetime.now().isoformat()
+            self.save_index(name, state['index'])
+            self.save_metadata(name, state['metadata'])
+            state['unsaved'] = 0
 
     def _create_empty_index(self) -> Dict[str, Any]:
         """建立空索引結構"""
         return {
+            'index_format': INDEX_FORMAT_VERSION,
             'by_date': {},
             'by_category': {},
-            'by_id': {}
+            'by_id': {field: [] for field in BY_ID_FIELDS}
         }
 
     def _create_empty_metadata(self, source: str) -> Dict[str, Any]:
@@ -214,3 +575,77 @@ class IndexManager:
             'date_range': [None, None],
             'created_at': datetime.now().isoformat()
         }
+
+
+def _update_date_range(partial: Dict[str, Any], date: str):
+    """更新部分索引的日期範圍"""
+    if partial['min_date'] is None or date < partial['min_date']:
+        partial['min_date'] = date
+    if partial['max_date'] is None or date > partial['max_date']:
+        partial['max_date'] = date
+
+
+def _empty_partial_index() -> Dict[str, Any]:
+    """建立空的部分索引"""
+    return {
+        'by_date': {},
+        'by_category': {},
+        'by_id': {field: [] for field in BY_ID_FIELDS},
+        'min_date': None,
+        'max_date': None,
+    }
+
+
+def _partial_index(job: Tuple[int, List[Tuple[bool, Any, Optional[str], Any]]]) -> Dict[str, Any]:
+    """
+    為一個區塊建立部分索引（供行程池呼叫，需為模組層級函數）
+
+    Args:
+        job: (區塊第一筆的行號, IndexManager._index_fields 取出的欄位列表)
+
+    Returns:
+        部分索引：by_date、by_category、by_id 與 min_date、max_date
+    """
+    first_line, records = job
+    partial = _empty_partial_index()
+
+    for line_num, record in enumerate(records, first_line):
+        date = IndexManager._index_record(partial['by_date'], partial['by_category'], partial['by_id'], record, line_num)
+        if date:
+            _update_date_range(partial, date)
+
+    return partial
+
+
+def _merge_partial_index(merged: Dict[str, Any], partial: Dict[str, Any]):
+    """
+    將後一個區塊的部分索引合併進 merged（需依行號順序合併）
+
+    Args:
+        merged: 已合併的部分索引（就地更新）
+        partial: 後一個區塊的部分索引
+    """
+    by_date = merged['by_date']
+    for date, entry in partial['by_date'].items():
+        existing = by_date.get(date)
+        if existing is None:
+            by_date[date] = entry
+        else:
+            existing['line_numbers'].extend(entry['line_numbers'])
+            existing['count'] += entry['count']
+
+    by_category = merged['by_category']
+    for category, entry in partial['by_category'].items():
+        existing = by_category.get(category)
+        if existing is None:
+            by_category[category] = entry
+        else:
+            existing['count'] += entry['count']
+            existing['latest_line'] = entry['latest_line']
+
+    for field in BY_ID_FIELDS:
+        merged['by_id'][field].extend(partial['by_id'][field])
+
+    if partial['min_date'] is not None:
+        _update_date_range(merged, partial['min_date'])
+        _update_date_range(merged, partial['max_date'])
@@ -1,11 +1,67 @@
 """JSONL 儲存處理模組"""
 
 import json
+import mmap
+import os
+import threading
 from pathlib import Path
-from typing import List, Dict, Any, Iterator, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 from datetime import datetime
 from loguru import logger
 
+from ..utils.helpers import json_dumps, json_loads
+
+# count_items 每次讀取的區塊大小
+COUNT_CHUNK_SIZE = 1024 * 1024
+
+# 讀寫 JSONL 的緩衝區大小
+IO_BUFFER_SIZE = 64 * 1024
+
+# write_stream 每批寫入的筆數
+STREAM_BATCH_SIZE = 100
+
+
+def _open_write(path: Path, mode: str = 'a'):
+    """
+    以 os.open 開啟 JSONL 供寫入（二進位模式，不做換行轉換）
+
+    追加模式使用 O_APPEND，由核心保證每次 write 都寫在檔尾
+
+    Args:
+        path: 檔案路徑
+        mode: 寫入模式 ('w' 覆蓋, 'a' 追加)
+
+    Returns:
+        緩衝的二進位檔案物件
+    """
+    flags = os.O_WRONLY | os.O_CREAT | getattr(os, 'O_CLOEXEC', 0)
+    flags |= os.O_TRUNC if mode == 'w' else os.O_APPEND
+    fd = os.open(path, flags, 0o666)
+    return os.fdopen(fd, mode + 'b', buffering=IO_BUFFER_SIZE)
+
+
+def _open_read(path: Path, willneed: bool = False):
+    """
+    開啟 JSONL 供循序讀取，並提示核心加大預讀
+
+    Args:
+        path: 檔案路徑
+        willneed: 是否會讀取整個檔案（提示核心提前載入）
+
+    Returns:
+        緩衝的二進位檔案物件
+    """
+    f = open(path, 'rb', buffering=IO_BUFFER_SIZE)
+    if hasattr(os, 'posix_fadvise'):
+        try:
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            if willneed:
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            # 部分檔案系統不支援，提示失敗不影響讀取
+            pass
+    return f
+
 
 class JSONLHandler:
     """JSONL 檔案處理器"""
@@ -20,6 +76,14 @@ class JSONLHandler:
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
+        # 各資料源的目錄與 JSONL 路徑快取（目錄只在第一次取得時建立）
+        self._data_paths: Dict[str, Path] = {}
+        self._jsonl_paths: Dict[str, Path] = {}
+
+        # 各資料源目前的行數（第一次需要時以 count_items 計算，之後隨寫入累加）
+        self._line_counts: Dict[str, int] = {}
+        self._write_lock = threading.RLock()
+
     def get_data_path(self, source: str) -> Path:
         """
         取得資料目錄路徑
@@ -30,8 +94,11 @@ class JSONLHandler:
         Returns:
             資料目錄 Path
         """
-        path = self.data_dir / source
-        path.mkdir(parents=True, exist_ok=True)
+        path = self._data_paths.get(source)
+        if path is None:
+            path = self.data_dir / source
+            path.mkdir(parents=True, exist_ok=True)
+            self._data_paths[source] = path
         return path
 
     def get_jsonl_path(self, source: str) -> Path:
@@ -44,9 +111,12 @@ class JSONLHandler:
         Returns:
             JSONL 檔案 Path
         """
-        return self.get_data_path(source) / "raw.jsonl"
+        path = self._jsonl_paths.get(source)
+        if path is None:
+            path = self._jsonl_paths[source] = self.get_data_path(source) / "raw.jsonl"
+        return path
 
-    def write_items(self, source: str, items: List[Dict[str, Any]], mode: str = 'a'):
+    def write_items(self, source: str, items: List[Dict[str, Any]], mode: str = 'a', stamp: bool = True):
         """
         寫入資料到 JSONL
 
@@ -54,33 +124,116 @@ class JSONLHandler:
             source: 資料源名稱
             items: 資料列表
             mode: 寫入模式 ('w' 覆蓋, 'a' 追加)
+            stamp: 是否加上寫入時間戳 _write_timestamp（同一批共用一個時間）
         """
         jsonl_path = self.get_jsonl_path(source)
+        timestamp = datetime.now().isoformat() if stamp else None
 
         try:
-            with open(jsonl_path, mode, encoding='utf-8') as f:
-                for item in items:
-                    # 添加寫入時間戳
-                    item['_write_timestamp'] = datetime.now().isoformat()
+            self._write_batch(source, items, mode, timestamp)
+            logger.info(f"成功寫入 {len(items)} 筆資料到 {jsonl_path}")
+
+        except Exception as e:
+            logger.error(f"寫入 JSONL 失敗: {e}")
+            raise
 
-                    json_line = json.dumps(item, ensure_ascii=False)
-                    f.write(json_line + '\n')
+    def write_stream(
+        self,
+        source: str,
+        items: Iterable[Dict[str, Any]],
+        mode: str = 'w',
+        stamp: bool = True,
+        batch_size: int = STREAM_BATCH_SIZE
+    ) -> int:
+        """
+        串流寫入資料到 JSONL（逐批寫入，不需先將全部資料收集成列表）
 
-            logger.info(f"成功寫入 {len(items)} 筆資料到 {jsonl_path}")
+        第一批依 mode 寫入，之後的批次一律追加；沒有任何資料時不會動到既有檔案
+
+        Args:
+            source: 資料源名稱
+            items: 資料迭代器（例如爬蟲的 generator）
+            mode: 寫入模式 ('w' 覆蓋, 'a' 追加)
+            stamp: 是否加上寫入時間戳 _write_timestamp（整個串流共用一個時間）
+            batch_size: 每批寫入的筆數
+
+        Returns:
+            寫入筆數
+        """
+        jsonl_path = self.get_jsonl_path(source)
+        timestamp = datetime.now().isoformat() if stamp else None
+        total = 0
+        batch = []
+
+        try:
+            for item in items:
+                batch.append(item)
+                if len(batch) >= batch_size:
+                    self._write_batch(source, batch, mode, timestamp)
+                    total += len(batch)
+                    mode = 'a'
+                    batch = []
+
+            if batch:
+                self._write_batch(source, batch, mode, timestamp)
+                total += len(batch)
+
+            logger.info(f"成功寫入 {total} 筆資料到 {jsonl_path}")
+            return total
 
         except Exception as e:
             logger.error(f"寫入 JSONL 失敗: {e}")
             raise
 
-    def append_item(self, source: str, item: Dict[str, Any]):
+    def _write_batch(self, source: str, items: List[Dict[str, Any]], mode: str, timestamp: Optional[str]):
+        """
+        序列化並寫入一批資料，同時更新行數計數
+
+        Args:
+            source: 資料源名稱
+            items: 資料列表
+            mode: 寫入模式 ('w' 覆蓋, 'a' 追加)
+            timestamp: 寫入時間戳（None 表示不加 _write_timestamp）
+        """
+        # 先將整批序列化到同一個位元組緩衝區，序列化失敗時不會動到既有檔案
+        buf = bytearray()
+        for item in items:
+            # 添加寫入時間戳（寫入副本，不修改呼叫端的資料）
+            if timestamp is not None:
+                item = {**item, '_write_timestamp': timestamp}
+            buf += json_dumps(item, newline=True)
+
+        # 整批一次寫入，避免逐行 write；行數計數與寫入在同一把鎖內更新
+        with self._write_lock:
+            with _open_write(self.get_jsonl_path(source), mode) as f:
+                if buf:
+                    f.write(buf)
+
+            if mode == 'w':
+                self._line_counts[source] = len(items)
+            elif source in self._line_counts:
+                self._line_counts[source] += len(items)
+
+    def append_item(self, source: str, item: Dict[str, Any]) -> int:
         """
         追加單筆資料
 
         Args:
             source: 資料源名稱
             item: 單筆資料
+
+        Returns:
+            該筆資料的行號（從 1 起算，可傳給 IndexManager.add_to_index）
         """
-        self.write_items(source, [item], mode='a')
+        # 行數只在第一次追加時掃描檔案，之後由 write_items 累加，避免每筆都重讀整個檔案
+        if source not in self._line_counts:
+            with self._write_lock:
+                if source not in self._line_counts:
+                    self._line_counts[source] = self.count_items(source)
+
+        with self._write_lock:
+            self.write_items(source, [item], mode='a')
+            return self._line_counts[source]
 
     def read_all(self, source: str) -> List[Dict[str, Any]]:
         """
@@ -101,17 +254,13 @@ class JSONLHandler:
         items = []
 
         try:
-            with open(jsonl_path, 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    try:
-                        item = json.loads(line)
-                        items.append(item)
-                    except json.JSONDecodeError as e:
-                        logger.error(f"JSON 解析失敗 (第 {line_num} 行): {e}")
+            with _open_read(jsonl_path, willneed=True) as f:
+                # 空檔案無法 mmap
+                if os.fstat(f.fileno()).st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        if hasattr(mm, 'madvise'):
+                            mm.madvise(mmap.MADV_SEQUENTIAL)
+                        self._parse_lines(mm, items)
 
             logger.info(f"成功讀取 {len(items)} 筆資料從 {jsonl_path}")
             return items
@@ -120,6 +269,41 @@ class JSONLHandler:
             logger.error(f"讀取 JSONL 失敗: {e}")
             return []
 
+    @staticmethod
+    def _parse_lines(mm: mmap.mmap, items: List[Dict[str, Any]]):
+        """
+        逐行解析映射後的 JSONL，以 memoryview 切片直接交給 JSON 解析器（不複製、不解碼）
+
+        Args:
+            mm: JSONL 檔案的 mmap
+            items: 解析結果附加到此列表
+        """
+        view = memoryview(mm)
+        try:
+            size = len(mm)
+            start = 0
+            line_num = 0
+            while start < size:
+                end = mm.find(b'\n', start)
+                if end == -1:
+                    end = size
+                line_num += 1
+
+                line = view[start:end]
+                start = end + 1
+
+                try:
+                    if line:
+                        items.append(json_loads(line))
+                except json.JSONDecodeError as e:
+                    # 只有空白的行直接略過，不視為錯誤
+                    if line.tobytes().strip():
+                        logger.error(f"JSON 解析失敗 (第 {line_num} 行): {e}")
+                finally:
+                    line.release()
+        finally:
+            view.release()
+
     def stream_read(self, source: str) -> Iterator[Dict[str, Any]]:
         """
         串流讀取資料 (逐行讀取,節省記憶體)
@@ -137,14 +321,13 @@ class JSONLHandler:
             return
 
         try:
-            with open(jsonl_path, 'r', encoding='utf-8') as f:
+            with _open_read(jsonl_path) as f:
                 for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    if not line:
+                    if not line.strip():
                         continue
 
                     try:
-                        item = json.loads(line)
+                        item = json_loads(line)
                         yield item
                     except json.JSONDecodeError as e:
                         logger.error(f"JSON 解析失敗 (第 {line_num} 行): {e}")
@@ -169,25 +352,20 @@ class JSONLHandler:
 
         try:
             with open(jsonl_path, 'rb') as f:
-                # 移到檔案末尾
-                f.seek(0, 2)
-                file_size = f.tell()
-
-                if file_size == 0:
+                # 空檔案無法 mmap
+                if os.fstat(f.fileno()).st_size == 0:
                     return None
 
-                # 往回讀取找到最後一行
-                f.seek(-2, 2)
-                while f.read(1) != b'\n':
-                    if f.tell() <= 2:
-                        f.seek(0)
-                        break
-                    f.seek(-2, 1)
-
-                last_line = f.readline().decode('utf-8').strip()
+                # 以 mmap 反向搜尋最後一行的起點，不逐位元組 seek
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    end = len(mm)
+                    if mm[end - 1:end] == b'\n':
+                        end -= 1
+                    start = mm.rfind(b'\n', 0, end) + 1
+                    last_line = mm[start:end].strip()
 
                 if last_line:
-                    return json.loads(last_line)
+                    return json_loads(last_line)
 
         except Exception as e:
             logger.error(f"讀取最後一筆資料失敗: {e}")
@@ -198,6 +376,9 @@ class JSONLHandler:
         """
         計算資料筆數
 
+        以固定大小區塊讀取並計算換行數，不逐行解碼；write_items 每筆寫一行、不產生空行，
+        因此換行數即為筆數（最後一行沒有換行時再加 1）
+
         Args:
             source: 資料源名稱
 
@@ -210,8 +391,16 @@ class JSONLHandler:
             return 0
 
         try:
-            with open(jsonl_path, 'r', encoding='utf-8') as f:
-                return sum(1 for line in f if line.strip())
+            count = 0
+            last_chunk = b''
+            with _open_read(jsonl_path, willneed=True) as f:
+                for chunk in iter(lambda: f.read(COUNT_CHUNK_SIZE), b''):
+                    count += chunk.count(b'\n')
+                    last_chunk = chunk
+
+            if last_chunk and not last_chunk.endswith(b'\n'):
+                count += 1
+            return count
 
         except Exception as e:
             logger.error(f"計算資料筆數失敗: {e}")
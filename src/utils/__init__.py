@@ -2,6 +2,7 @@
 
 from .helpers import (
     generate_id,
+    make_id_factory,
     clean_text,
     parse_date,
     normalize_url
@@ -9,6 +10,7 @@ from .helpers import (
 
 __all__ = [
     'generate_id',
+    'make_id_factory',
     'clean_text',
     'parse_date',
     'normalize_url'
@@ -1,10 +1,37 @@
 """配置載入模組"""
 
-import yaml
+import copy
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any
+
+import yaml
 from loguru import logger
 
+try:
+    # libyaml 的 C 實作，解析速度遠快於純 Python 版本
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+
+@lru_cache(maxsize=16)
+def _load_yaml_cached(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """
+    解析 YAML 檔案（依路徑與修改時間快取，檔案變更後自動重新解析）
+
+    Args:
+        path: 檔案路徑
+        mtime_ns: 檔案修改時間（僅作為快取鍵）
+
+    Returns:
+        配置字典
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        config = yaml.load(f, Loader=_SafeLoader)
+    logger.info(f"成功載入配置: {path}")
+    return config or {}
+
 
 class ConfigLoader:
     """配置檔案載入器"""
@@ -35,15 +62,19 @@ class ConfigLoader:
             return {}
 
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = yaml.safe_load(f)
-                logger.info(f"成功載入配置: {config_path}")
-                return config or {}
+            config = _load_yaml_cached(str(config_path), config_path.stat().st_mtime_ns)
+            # 返回副本，避免呼叫端修改到快取內容
+            return copy.deepcopy(config)
 
         except Exception as e:
             logger.error(f"載入配置失敗: {config_path} - {e}")
             return {}
 
+    @staticmethod
+    def clear_cache():
+        """清除 YAML 解析快取"""
+        _load_yaml_cached.cache_clear()
+
     def get_sources_config(self) -> Dict[str, Any]:
         """載入資料源配置"""
         return self.load_yaml('sources.yaml')
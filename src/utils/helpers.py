@@ -1,11 +1,32 @@
 """輔助函數模組"""
 
+import os
 import re
+import json
+import random
 import hashlib
 from datetime import datetime
-from typing import Optional
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
 from urllib.parse import urljoin
 
+try:
+    import orjson
+except ImportError:
+    # orjson 未安裝時退回標準庫 json
+    orjson = None
+
+# 連續空白
+_WS_RE = re.compile(r'\s+')
+
+# 法規名稱匹配模式：XXX法、XXX辦法、XXX規則、XXX條例
+_LAW_RES = [
+    re.compile(r'[^。，\n]{2,30}法(?![律規])'),
+    re.compile(r'[^。，\n]{2,30}辦法'),
+    re.compile(r'[^。，\n]{2,30}規則'),
+    re.compile(r'[^。，\n]{2,30}條例'),
+]
+
 
 def generate_id(source: str, date: str, index: int) -> str:
     """
@@ -23,6 +44,25 @@ def generate_id(source: str, date: str, index: int) -> str:
     return f"{source}_faq_{date_str}_{index:04d}"
 
 
+def make_id_factory(source: str, date: str) -> Callable[[int], str]:
+    """
+    建立固定來源與日期的 ID 生成函數（前綴只組合一次，供大量生成 ID 的迴圈使用）
+
+    Args:
+        source: 資料來源 (mol, bli, osha)
+        date: 日期 (YYYY-MM-DD)
+
+    Returns:
+        接受索引編號、返回與 generate_id 相同 ID 的函數
+    """
+    prefix = f"{source}_faq_{date.replace('-', '')}"
+
+    def make_id(index: int) -> str:
+        return f"{prefix}_{index:04d}"
+
+    return make_id
+
+
 def generate_hash(content: str) -> str:
     """
     生成內容 hash (用於去重)
@@ -31,9 +71,85 @@ def generate_hash(content: str) -> str:
         content: 內容文字
 
     Returns:
-        SHA256 hash
+        64 位元 BLAKE2b hash（16 個十六進位字元）
+    """
+    # 僅用於去重、不需密碼學強度；直接產生 8 位元組摘要，不必計算完整 SHA-256 再截斷
+    return hashlib.blake2b(content.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def backoff_delay(attempt: int, base: float = 1.0, max_delay: float = 30.0) -> float:
+    """
+    計算重試的指數退避秒數 (含隨機抖動)
+
+    Args:
+        attempt: 第幾次重試 (從 0 開始)
+        base: 第一次重試的基準秒數
+        max_delay: 退避秒數上限 (不含抖動)
+
+    Returns:
+        等待秒數；加上至多一半的隨機抖動，避免多個爬蟲同時重試
+    """
+    delay = min(base * (1 << attempt), max_delay)
+    return delay + random.uniform(0, 0.5 * delay)
+
+
+def json_dumps(obj: Any, indent: bool = False, newline: bool = False) -> bytes:
+    """
+    序列化為 UTF-8 JSON 位元組（優先使用 orjson）
+
+    Args:
+        obj: 要序列化的物件
+        indent: 是否以 2 格縮排輸出
+        newline: 是否在結尾加上換行（JSONL 用）
+
+    Returns:
+        JSON 位元組
     """
-    return hashlib.sha256(content.encode('utf-8')).hexdigest()[:16]
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if newline:
+            option |= orjson.OPT_APPEND_NEWLINE
+        return orjson.dumps(obj, option=option)
+
+    text = json.dumps(obj, ensure_ascii=False, indent=2 if indent else None)
+    if newline:
+        text += '\n'
+    return text.encode('utf-8')
+
+
+def json_loads(data: Union[str, bytes, memoryview]) -> Any:
+    """
+    解析 JSON（優先使用 orjson；解析失敗時拋出 json.JSONDecodeError）
+
+    Args:
+        data: JSON 字串、位元組或 memoryview
+
+    Returns:
+        解析結果
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def atomic_write(path: Path, data: bytes):
+    """
+    原子寫入檔案：先寫入暫存檔並 fsync，再以 os.replace 取代，避免中斷時留下損毀的檔案
+
+    Args:
+        path: 目標檔案路徑
+        data: 檔案內容
+    """
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
 
 
 def clean_text(text: str) -> str:
@@ -50,7 +166,7 @@ def clean_text(text: str) -> str:
         return ""
 
     # 移除多餘空白
-    text = re.sub(r'\s+', ' ', text)
+    text = _WS_RE.sub(' ', text)
 
     # 移除前後空白
     text = text.strip()
@@ -71,6 +187,17 @@ def parse_date(date_str: str) -> Optional[str]:
     if not date_str:
         return None
 
+    date_str = date_str.strip()
+
+    # 快速路徑：已是 YYYY-MM-DD（絕大多數情況），直接以切片轉換，不經 strptime
+    if len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
+        year, month, day = date_str[:4], date_str[5:7], date_str[8:]
+        if year.isdecimal() and month.isdecimal() and day.isdecimal():
+            try:
+                return datetime(int(year), int(month), int(day)).strftime('%Y-%m-%d')
+            except ValueError:
+                return None
+
     # 常見日期格式
     formats = [
         '%Y-%m-%d',
@@ -81,7 +208,7 @@ def parse_date(date_str: str) -> Optional[str]:
 
     for fmt in formats:
         try:
-            dt = datetime.strptime(date_str.strip(), fmt)
+            dt = datetime.strptime(date_str, fmt)
             return dt.strftime('%Y-%m-%d')
         except ValueError:
             continue
@@ -125,21 +252,16 @@ def extract_related_laws(text: str) -> list:
         法規清單 (名稱列表)
     """
     laws = []
+    seen = set()
 
-    # 匹配模式：XXX法、XXX辦法、XXX規則、XXX條例
-    patterns = [
-        r'[^。，\n]{2,30}法(?![律規])',
-        r'[^。，\n]{2,30}辦法',
-        r'[^。，\n]{2,30}規則',
-        r'[^。，\n]{2,30}條例',
-    ]
-
-    for pattern in patterns:
-        matches = re.findall(pattern, text)
+    # 各模式分別掃描（合併成單一交替式會因匹配不重疊而漏掉較短的法規名稱）
+    for pattern in _LAW_RES:
+        matches = pattern.findall(text)
         for match in matches:
             cleaned = match.strip()
             # 避免重複
-            if cleaned and cleaned not in laws and len(cleaned) > 3:
+            if len(cleaned) > 3 and cleaned not in seen:
+                seen.add(cleaned)
                 laws.append(cleaned)
 
     return laws